@@ -249,21 +249,20 @@ async def process_files(
                 progress.update(1, description=f"Error: {file_path.name}")
                 return None
         
-        # Process files in batches
-        concurrency = config.get_concurrency()
+        # Process files with a sliding window of concurrent requests, so a slow file
+        # only holds up its own slot instead of the whole batch it was started with
+        semaphore = asyncio.Semaphore(config.get_concurrency())
         
-        # Process files in batches
-        batch_size = concurrency
-        for i in range(0, len(files), batch_size):
-            batch = files[i:i+batch_size]
-            
-            # Process batch
-            results = await asyncio.gather(*[process_file(file) for file in batch])
-            
-            # Add results to manifest
-            for result in results:
-                if result:
-                    file_manifest[result.path] = result
+        async def process_file_bounded(file_path: Path) -> Optional[FileInfo]:
+            async with semaphore:
+                return await process_file(file_path)
+        
+        results = await asyncio.gather(*[process_file_bounded(file) for file in files])
+        
+        # Add results to manifest
+        for result in results:
+            if result:
+                file_manifest[result.path] = result
     
     # Calculate elapsed time
     elapsed_time = time.time() - start_time
@@ -426,6 +425,7 @@ async def main():
     
     # Temp directory for cloned repo
     temp_dir = None
+    llm_client = None
     
     # Create output directory for potential copying later (only if needed)
     output_dir = None
@@ -676,6 +676,10 @@ async def main():
         
         print("\nDone!")
     finally:
+        # Release pooled connections held by the LLM client
+        if llm_client is not None:
+            await llm_client.close()
+        
         # Clean up temporary directory if needed
         if temp_dir and not args.keep_clone:
             try:
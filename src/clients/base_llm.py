@@ -333,4 +333,19 @@ class BaseLLMClient(ABC):
             # Returns: ["src/utils.py", "src/main.py"]
             ```
         """
-        pass
\ No newline at end of file
+        pass
+
+    async def close(self) -> None:
+        """
+        Release any network resources held by the client.
+        
+        The default implementation does nothing; clients that keep a
+        connection pool open should override it.
+        """
+        pass
+    
+    async def __aenter__(self) -> "BaseLLMClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
@@ -21,6 +21,7 @@ from .llm_utils import (
     format_project_structure,
     find_common_dependencies,
     identify_key_components,
+    format_component_summaries,
     get_default_order,
     fix_markdown_issues,
     prepare_file_order_data,
@@ -28,6 +29,7 @@ from .llm_utils import (
 )
 from ..analyzers.codebase import CodebaseAnalyzer
 from ..utils.prompt_manager import PromptTemplate
+from ..utils.cache import ResponseCache
 from ..utils.progress import ProgressTracker
 from ..utils.retry import async_retry
 from ..utils.tokens import TokenCounter
@@ -105,6 +107,14 @@ class BedrockClient(BaseLLMClient):
         # Add temperature setting
         self.temperature = config.bedrock.temperature
         
+        # Cache responses to identical requests; only deterministic output is reusable
+        if config.no_cache or self.temperature != 0:
+            self.response_cache = None
+        else:
+            # Responses are kept in a bounded in-memory cache for this run; unchanged files
+            # are skipped across runs by the per-file summary cache instead
+            self.response_cache = ResponseCache(ttl=config.cache.ttl)
+        
     def _initialize_bedrock_client(self) -> boto3.client:
         """
         Initialize the AWS Bedrock client with proper configuration.
@@ -391,32 +401,9 @@ class BedrockClient(BaseLLMClient):
     def _find_common_dependencies(self, file_manifest: dict) -> str:
         """Extract common dependencies from file manifest."""
         try:
-            # Log detailed information about file_manifest
-            logging.debug(f"_find_common_dependencies called with file_manifest type: {type(file_manifest)}")
-            if file_manifest:
-                sample_key = next(iter(file_manifest))
-                sample_value = file_manifest[sample_key]
-                logging.debug(f"Sample key type: {type(sample_key)}, value: {sample_key}")
-                logging.debug(f"Sample value type: {type(sample_value)}")
-                if hasattr(sample_value, '__dict__'):
-                    logging.debug(f"Sample value attributes: {dir(sample_value)}")
-                elif isinstance(sample_value, dict):
-                    logging.debug(f"Sample value keys: {sample_value.keys()}")
-            else:
-                logging.debug("file_manifest is empty")
-            
-            # Convert file_manifest if needed
-            # If file_manifest contains FileInfo objects but find_common_dependencies expects dicts
-            converted_manifest = {}
-            for path, info in file_manifest.items():
-                if hasattr(info, 'to_dict'):
-                    # Convert FileInfo to dict if needed
-                    converted_manifest[path] = info.to_dict()
-                else:
-                    # Keep as is
-                    converted_manifest[path] = info
-            
-            result = find_common_dependencies(converted_manifest, self.debug)
+            # Pass the manifest through unchanged so the memoized result for it is reused;
+            # find_common_dependencies handles both dicts and FileInfo objects
+            result = find_common_dependencies(file_manifest, self.debug)
             # Ensure result is a string
             if not isinstance(result, str):
                 logging.warning(f"find_common_dependencies returned non-string: {type(result)}")
@@ -431,18 +418,8 @@ class BedrockClient(BaseLLMClient):
     def _identify_key_components(self, file_manifest: dict) -> str:
         """Identify key components from file manifest."""
         try:
-            # Convert file_manifest if needed
-            # If file_manifest contains FileInfo objects but identify_key_components expects dicts
-            converted_manifest = {}
-            for path, info in file_manifest.items():
-                if hasattr(info, 'to_dict'):
-                    # Convert FileInfo to dict if needed
-                    converted_manifest[path] = info.to_dict()
-                else:
-                    # Keep as is
-                    converted_manifest[path] = info
-            
-            result = identify_key_components(converted_manifest, self.debug)
+            # Pass the manifest through unchanged so the memoized result for it is reused
+            result = identify_key_components(file_manifest, self.debug)
             # Ensure result is a string
             if not isinstance(result, str):
                 logging.warning(f"identify_key_components returned non-string: {type(result)}")
@@ -452,6 +429,10 @@ class BedrockClient(BaseLLMClient):
             logging.error(f"Error in _identify_key_components: {e}")
             return "No key components identified."
     
+    def _format_component_summaries(self, file_manifest: dict) -> str:
+        """Format a representative sample of file summaries per component."""
+        return format_component_summaries(file_manifest, self.debug)
+    
     def _derive_project_name(self, file_manifest: dict) -> str:
         """Derive project name from repository structure."""
         try:
@@ -517,29 +498,42 @@ class BedrockClient(BaseLLMClient):
         Raises:
             Various exceptions from the underlying API call
         """
-        # Combine for Claude
-        combined_content = f"{system_content}\n\n{user_content}"
-        
-        # Create proper Bedrock format
+        # Build the Anthropic Messages request directly: the system prompt goes in the
+        # top-level system field instead of being concatenated into the user message,
+        # so the large user content is never copied and the system prefix stays stable
         bedrock_messages = [
             {
                 "role": "user",
-                "content": [{"type": "text", "text": combined_content}]
+                "content": [{"type": "text", "text": user_content}]
             }
         ]
         
         # Use provided max_tokens or default
         tokens_to_generate = max_tokens or self.max_tokens
         
+        # Return the stored response if this exact request was answered before
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = ResponseCache.make_key(
+                self.model_id, self.temperature, tokens_to_generate, system_content, user_content
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        request_body = {
+            "anthropic_version": BEDROCK_API_VERSION,
+            "max_tokens": tokens_to_generate,
+            "messages": bedrock_messages,
+            "temperature": self.temperature
+        }
+        if system_content:
+            request_body["system"] = system_content
+        
         # Invoke model
         response = await asyncio.to_thread(
             self.client.invoke_model,
-            body=json.dumps({
-                "anthropic_version": BEDROCK_API_VERSION,
-                "max_tokens": tokens_to_generate,
-                "messages": bedrock_messages,
-                "temperature": self.temperature
-            }),
+            body=json.dumps(request_body),
             modelId=self.model_id
         )
         
@@ -548,7 +542,10 @@ class BedrockClient(BaseLLMClient):
         content = response_body['content'][0]['text']
         
         # Fix any markdown issues
-        return self._fix_markdown_issues(content)
+        content = self._fix_markdown_issues(content)
+        if cache_key is not None:
+            self.response_cache.set(cache_key, content)
+        return content
     
     @async_retry(
         retries=3,
@@ -583,31 +580,8 @@ class BedrockClient(BaseLLMClient):
                     # Get key components
                     key_components = self._identify_key_components(file_manifest)
                     
-                    # Create a summary of file contents for context
-                    file_summaries = []
-                    
-                    # First, categorize files by directory/component
-                    file_by_component = {}
-                    for path, info in file_manifest.items():
-                        if info.get('summary') and not info.get('is_binary', False):
-                            directory = str(Path(path).parent)
-                            if directory not in file_by_component:
-                                file_by_component[directory] = []
-                            file_by_component[directory].append((path, info.get('summary', 'No summary available')))
-                    
-                    # For each component, include a representative sample of files
-                    for directory, files in file_by_component.items():
-                        # Add component header
-                        file_summaries.append(f"## Component: {directory}")
-                        
-                        # Sort files by potential importance (e.g., longer summaries might be more important)
-                        files.sort(key=lambda x: len(x[1]), reverse=True)
-                        
-                        # Take up to 3 files per component to ensure broad coverage
-                        for path, summary in files[:3]:
-                            file_summaries.append(f"File: {path}\nSummary: {summary}")
-                    
-                    file_summaries_text = "\n\n".join(file_summaries)
+                    # Summaries of a representative sample of files per component
+                    file_summaries_text = self._format_component_summaries(file_manifest)
                     
                     # Get messages from MessageManager
                     messages = MessageManager.get_architecture_content_messages(
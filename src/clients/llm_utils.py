@@ -1,11 +1,21 @@
 """Shared utilities for LLM clients."""
+import functools
+import heapq
 import json
 import logging
 import re
 import traceback
-from collections import defaultdict
-from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from collections import Counter, defaultdict, namedtuple
+from typing import List, Tuple, Dict, Optional, Pattern
+
+from ..models.file_info import FileInfo
+
+# orjson is an optional, faster JSON parser; its decode errors subclass json.JSONDecodeError
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 # Default configuration values that could be moved to a config file
 DEFAULT_MAX_COMPONENTS = 10  # Maximum number of key components to display
 
@@ -26,6 +36,141 @@ DEFAULT_VENDOR_PATTERNS = [
     r'\.sln$'                         # Solution files
 ]
 
+# Indentation strings for project structure lines, indexed by depth (two spaces per level)
+MAX_PRECOMPUTED_INDENT = 128
+_INDENTS = tuple(' ' * i for i in range(0, MAX_PRECOMPUTED_INDENT, 2))
+
+# Compact per-file record sent to the LLM for file ordering; use _asdict() to serialize
+FileOrderInfo = namedtuple('FileOrderInfo', ['type', 'size', 'is_binary', 'dependencies', 'exports'])
+
+# Precompiled patterns for dependency extraction
+_NPM_DEPENDENCIES_BLOCK_RE = re.compile(r'"dependencies"\s*:\s*{([^}]+)}')
+_NPM_DEPENDENCY_RE = re.compile(r'"([^"]+)"\s*:\s*"([^"]+)"')
+_CSPROJ_PACKAGE_RE = re.compile(r'<PackageReference\s+Include="([^"]+)"\s+Version="([^"]+)"')
+_PACKAGES_CONFIG_RE = re.compile(r'<package\s+id="([^"]+)"\s+version="([^"]+)"')
+_POM_DEPENDENCY_RE = re.compile(
+    r'<dependency>\s*<groupId>([^<]+)</groupId>\s*<artifactId>([^<]+)</artifactId>\s*<version>([^<]+)</version>',
+    re.DOTALL
+)
+_GRADLE_DEPENDENCY_RE = re.compile(r'(?:implementation|compile)\s+[\'"]([^:\'"]*)(?::([^:\'"]*))?(?::([^\'"]*))?(?::[^\'"]*)?[\'"]')
+_GRADLE_KTS_DEPENDENCY_RE = re.compile(r'(?:implementation|compile)\([\'"](.*?)[\'"]')
+
+# Precompiled patterns for markdown fixes
+_LIST_ITEM_RE = re.compile(r'^(\s*)[-*+]\s')
+_LIST_ITEM_LINE_RE = re.compile(r'^\s*[-*+]\s', re.MULTILINE)
+
+# Extensions of configuration files placed first in the default file order
+CONFIG_FILE_EXTENSIONS = ('.json', '.config', '.settings')
+
+# Number of summarized files included per component in architecture prompts
+DEFAULT_FILES_PER_COMPONENT = 3
+
+# Maximum number of memoized manifest helper results to keep
+MANIFEST_CACHE_SIZE = 32
+
+# Manifest fields read by the memoized helpers; a change to any of them changes the fingerprint
+_FINGERPRINT_FIELDS = ('content', 'summary', 'is_binary', 'size')
+
+# Memoized helper results keyed on (helper name, manifest fingerprint, options).
+# Only the result strings are stored, never the manifests themselves.
+_manifest_cache: Dict[Tuple, str] = {}
+
+def _manifest_fingerprint(file_manifest: Dict[str, Dict]) -> Optional[int]:
+    """
+    Fingerprint the parts of a manifest that the memoized helpers depend on.
+    
+    String hashes are cached on the string objects, so re-fingerprinting an
+    unchanged manifest does not rehash file contents.
+    
+    Returns:
+        The fingerprint, or None if the manifest holds unhashable field values
+    """
+    entries = []
+    for path, info in file_manifest.items():
+        if isinstance(info, dict):
+            values = tuple(info.get(field) for field in _FINGERPRINT_FIELDS)
+        else:
+            values = tuple(getattr(info, field, None) for field in _FINGERPRINT_FIELDS)
+        entries.append((path, values))
+    try:
+        return hash(tuple(entries))
+    except TypeError:
+        return None
+
+def _manifest_cache_key(helper: str, file_manifest: Dict[str, Dict], *options) -> Optional[Tuple]:
+    """Build the memo key for a helper call, or None if the manifest cannot be fingerprinted."""
+    fingerprint = _manifest_fingerprint(file_manifest)
+    if fingerprint is None:
+        return None
+    return (helper, fingerprint, *options)
+
+def _get_cached_result(key: Optional[Tuple]) -> Optional[str]:
+    """Return a memoized helper result, if any."""
+    if key is None:
+        return None
+    return _manifest_cache.get(key)
+
+def _store_cached_result(key: Optional[Tuple], result: str) -> None:
+    """Memoize a helper result, evicting the oldest entry when the cache is full."""
+    if key is None:
+        return
+    if len(_manifest_cache) >= MANIFEST_CACHE_SIZE:
+        _manifest_cache.pop(next(iter(_manifest_cache)))
+    _manifest_cache[key] = result
+
+def invalidate_manifest_cache() -> None:
+    """
+    Clear memoized results of the manifest helpers.
+    
+    Results are keyed on a fingerprint of the manifest's paths and file fields,
+    so edited manifests are recomputed without calling this; it only frees memory.
+    """
+    _manifest_cache.clear()
+
+def _indent(depth: int) -> str:
+    """Return the indentation string for a tree depth (two spaces per level)."""
+    indent = depth * 2
+    return _INDENTS[depth] if indent < MAX_PRECOMPUTED_INDENT else ' ' * indent
+
+def _tree_sort_key(parts: List[str]) -> Tuple[Tuple[int, str], ...]:
+    """
+    Sort key placing each file before the subdirectories of its directory.
+    
+    Directory components sort as (1, name) and the file name as (0, name), so a
+    linear walk over sorted paths visits every directory's files first and then
+    its subdirectories in name order.
+    """
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+def _format_tree(file_paths: List[str]) -> List[str]:
+    """
+    Format '/'-separated file paths as tree lines, listing files before sorted subdirectories.
+    
+    Walks the paths once in tree order, opening a directory line whenever a path
+    leaves the directories shared with the previous path.
+    """
+    out: List[str] = []
+    open_dirs: List[str] = []
+    file_prefix = '- '
+    for parts in sorted((path.split('/') for path in file_paths), key=_tree_sort_key):
+        dirs = parts[:-1]
+        
+        # Find how many leading directories are shared with the previous path
+        common = 0
+        max_common = min(len(open_dirs), len(dirs))
+        while common < max_common and open_dirs[common] == dirs[common]:
+            common += 1
+        
+        # Open the directories this path adds; the file prefix only changes with the directory
+        if common != len(dirs) or common != len(open_dirs):
+            for depth in range(common, len(dirs)):
+                out.append(_indent(depth) + '+ ' + dirs[depth] + '/')
+            file_prefix = _indent(len(dirs)) + '- '
+        
+        out.append(file_prefix + parts[-1])
+        open_dirs = dirs
+    return out
+
 def format_project_structure(file_manifest: Dict[str, Dict], debug: bool = False, force_compression: Optional[bool] = None) -> str:
     """
     Build a tree-like project structure string from file manifest.
@@ -39,12 +184,16 @@ def format_project_structure(file_manifest: Dict[str, Dict], debug: bool = False
         A formatted string representing the project structure
     """
     logging.debug("Formatting project structure")
+    cache_key = _manifest_cache_key('format_project_structure', file_manifest, force_compression)
+    cached = _get_cached_result(cache_key)
+    if cached is not None:
+        return cached
     try:
-        # Import path compression utilities
-        from ..utils.path_compression import compress_paths, get_compression_explanation
-        
-        # Get file paths from manifest
-        file_paths = [str(path).replace('\\', '/') for path in file_manifest.keys()]
+        # Get file paths from manifest, normalizing separators only where needed
+        file_paths = []
+        for path in file_manifest:
+            path_str = path if isinstance(path, str) else str(path)
+            file_paths.append(path_str.replace('\\', '/') if '\\' in path_str else path_str)
         
         # Check if we should use path compression
         # If force_compression is provided, use that value
@@ -52,88 +201,23 @@ def format_project_structure(file_manifest: Dict[str, Dict], debug: bool = False
         use_compression = force_compression if force_compression is not None else len(file_paths) > 50
         
         if use_compression:
+            # Import path compression utilities only when they are actually needed
+            from ..utils.path_compression import compress_paths, get_compression_explanation
+            
             # Apply path compression to reduce token usage
             compressed_paths, decompression_map = compress_paths(file_paths)
-            
-            # Create a nested dictionary to represent the directory structure
-            directories: Dict[str, Dict] = {}
-            
-            for path in compressed_paths:
-                parts = path.split('/')
-                current_dir = directories
-                
-                # Navigate through the directory structure
-                for i, part in enumerate(parts[:-1]):  # All parts except the last one (filename)
-                    if part not in current_dir:
-                        current_dir[part] = {}
-                    current_dir = current_dir[part]
-                
-                # Add the file to the current directory
-                if '_files' not in current_dir:
-                    current_dir['_files'] = []
-                current_dir['_files'].append(parts[-1])  # The last part is the filename
-            
-            # Format the directory structure as a string
-            def format_dir(dir_dict: Dict, indent: int = 0) -> List[str]:
-                result = []
-                # First list all files in the current directory
-                if '_files' in dir_dict:
-                    for file in sorted(dir_dict['_files']):
-                        result.append(' ' * indent + '- ' + file)
-                
-                # Then list all subdirectories
-                for name, contents in sorted(dir_dict.items()):
-                    if name != '_files':
-                        result.append(' ' * indent + '+ ' + name + '/')
-                        result.extend(format_dir(contents, indent + 2))
-                
-                return result
-            
-            structure_lines = format_dir(directories)
-            formatted_structure = '\n'.join(structure_lines)
+            structure_lines = _format_tree(compressed_paths)
             
             # Add explanation of compression scheme
             compression_explanation = get_compression_explanation(decompression_map)
-            formatted_structure = compression_explanation + "\n\n" + formatted_structure
+            formatted_structure = compression_explanation + "\n\n" + '\n'.join(structure_lines)
         else:
-            # Use the original approach for smaller projects
-            directories: Dict[str, Dict] = {}
-            
-            for path in file_paths:
-                parts = path.split('/')
-                current_dir = directories
-                
-                # Navigate through the directory structure
-                for i, part in enumerate(parts[:-1]):  # All parts except the last one (filename)
-                    if part not in current_dir:
-                        current_dir[part] = {}
-                    current_dir = current_dir[part]
-                
-                # Add the file to the current directory
-                if '_files' not in current_dir:
-                    current_dir['_files'] = []
-                current_dir['_files'].append(parts[-1])  # The last part is the filename
-            
-            # Format the directory structure as a string
-            def format_dir(dir_dict: Dict, indent: int = 0) -> List[str]:
-                result = []
-                # First list all files in the current directory
-                if '_files' in dir_dict:
-                    for file in sorted(dir_dict['_files']):
-                        result.append(' ' * indent + '- ' + file)
-                
-                # Then list all subdirectories
-                for name, contents in sorted(dir_dict.items()):
-                    if name != '_files':
-                        result.append(' ' * indent + '+ ' + name + '/')
-                        result.extend(format_dir(contents, indent + 2))
-                
-                return result
-            
-            structure_lines = format_dir(directories)
+            # Use the uncompressed paths for smaller projects
+            structure_lines = _format_tree(file_paths)
             formatted_structure = '\n'.join(structure_lines)
         
-        logging.debug(f"Project structure formatted successfully with {len(structure_lines)} lines")
+        logging.debug("Project structure formatted successfully with %d lines", len(structure_lines))
+        _store_cached_result(cache_key, formatted_structure)
         return formatted_structure
     except Exception as e:
         logging.error(f"Error formatting project structure: {e}")
@@ -141,6 +225,95 @@ def format_project_structure(file_manifest: Dict[str, Dict], debug: bool = False
             print(f"Error formatting project structure: {e}")
             print(traceback.format_exc())
         return "Error formatting project structure"
+def _parse_package_json(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect npm dependencies from package.json content (JavaScript/Node.js)."""
+    # Try to parse as JSON first (most reliable)
+    try:
+        package_data = _json_loads(content)
+    except json.JSONDecodeError:
+        # Fallback to regex if JSON parsing fails
+        # Extract dependencies section
+        deps_match = _NPM_DEPENDENCIES_BLOCK_RE.search(content)
+        if deps_match:
+            deps_str = deps_match.group(1)
+            # Extract each dependency
+            for dep_match in _NPM_DEPENDENCY_RE.finditer(deps_str):
+                dep_name = dep_match.group(1)
+                dep_version = dep_match.group(2)
+                dependencies[f"npm:{dep_name}@{dep_version}"] += 1
+        return
+    
+    if not isinstance(package_data, dict):
+        return
+    # Process dependencies
+    if isinstance(package_data.get("dependencies"), dict):
+        for dep_name, dep_version in package_data["dependencies"].items():
+            if isinstance(dep_version, str):
+                dependencies[f"npm:{dep_name}@{dep_version}"] += 1
+    # Process devDependencies
+    if isinstance(package_data.get("devDependencies"), dict):
+        for dep_name, dep_version in package_data["devDependencies"].items():
+            if isinstance(dep_version, str):
+                dependencies[f"npm-dev:{dep_name}@{dep_version}"] += 1
+
+def _parse_requirements_txt(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect Python dependencies from requirements.txt content."""
+    for line in content.splitlines():
+        line = line.strip()
+        if line and line[0] != '#':
+            dependencies[f"python:{line}"] += 1
+
+def _parse_csproj(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect NuGet PackageReference elements from .csproj content (C#)."""
+    for match in _CSPROJ_PACKAGE_RE.finditer(content):
+        package_name = match.group(1)
+        version = match.group(2)
+        dependencies[f"nuget:{package_name}@{version}"] += 1
+
+def _parse_packages_config(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect NuGet package elements from packages.config content (C#)."""
+    for match in _PACKAGES_CONFIG_RE.finditer(content):
+        package_name = match.group(1)
+        version = match.group(2)
+        dependencies[f"nuget:{package_name}@{version}"] += 1
+
+def _parse_pom_xml(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect dependency elements from pom.xml content (Java/Maven)."""
+    for match in _POM_DEPENDENCY_RE.finditer(content):
+        group_id = match.group(1).strip()
+        artifact_id = match.group(2).strip()
+        version = match.group(3).strip()
+        dependencies[f"maven:{group_id}:{artifact_id}@{version}"] += 1
+
+def _parse_build_gradle(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect implementation/compile dependencies from build.gradle content (Java/Gradle)."""
+    for match in _GRADLE_DEPENDENCY_RE.finditer(content):
+        group, artifact, version = match.group(1, 2, 3)
+        if artifact:
+            group = group or ""
+            version = version or ""
+            dependencies[f"gradle:{group}:{artifact}@{version}"] += 1
+
+def _parse_build_gradle_kts(content: str, dependencies: Dict[str, int]) -> None:
+    """Collect implementation/compile dependencies from build.gradle.kts content (Kotlin DSL)."""
+    for match in _GRADLE_KTS_DEPENDENCY_RE.finditer(content):
+        dep_string = match.group(1)
+        dependencies[f"gradle-kts:{dep_string}"] += 1
+
+# (file name suffix, parser) pairs for each dependency manifest format, checked in order
+_DEPENDENCY_HANDLERS = (
+    ('package.json', _parse_package_json),
+    ('requirements.txt', _parse_requirements_txt),
+    ('.csproj', _parse_csproj),
+    ('packages.config', _parse_packages_config),
+    ('pom.xml', _parse_pom_xml),
+    ('build.gradle', _parse_build_gradle),
+    ('build.gradle.kts', _parse_build_gradle_kts),
+)
+
+# File name suffixes of the dependency manifests understood by find_common_dependencies
+DEPENDENCY_FILE_NAMES = tuple(name for name, _ in _DEPENDENCY_HANDLERS)
+
 def find_common_dependencies(file_manifest: Dict[str, Dict], debug: bool = False) -> str:
     """
     Extract common dependencies from file manifest.
@@ -153,264 +326,78 @@ def find_common_dependencies(file_manifest: Dict[str, Dict], debug: bool = False
         A formatted string listing detected dependencies
     """
     logging.debug("Finding common dependencies")
+    cache_key = _manifest_cache_key('find_common_dependencies', file_manifest)
+    cached = _get_cached_result(cache_key)
+    if cached is not None:
+        return cached
     try:
-        # Log file_manifest structure
-        logging.debug(f"File manifest type: {type(file_manifest)}")
-        if file_manifest:
-            sample_key = next(iter(file_manifest))
-            sample_value = file_manifest[sample_key]
-            logging.debug(f"Sample key type: {type(sample_key)}, value: {sample_key}")
-            logging.debug(f"Sample value type: {type(sample_value)}")
-            if hasattr(sample_value, '__dict__'):
-                logging.debug(f"Sample value attributes: {dir(sample_value)}")
-        else:
-            logging.debug("File manifest is empty")
+        # Log file_manifest structure (skipped entirely unless debug logging is enabled)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("File manifest type: %s", type(file_manifest))
+            if file_manifest:
+                sample_key = next(iter(file_manifest))
+                sample_value = file_manifest[sample_key]
+                logging.debug("Sample key type: %s, value: %s", type(sample_key), sample_key)
+                logging.debug("Sample value type: %s", type(sample_value))
+                if hasattr(sample_value, '__dict__'):
+                    logging.debug("Sample value attributes: %s", dir(sample_value))
+            else:
+                logging.debug("File manifest is empty")
             
         # Collect all dependencies
         dependencies = defaultdict(int)
-        package_json_count = 0
-        requirements_txt_count = 0
-        csproj_count = 0
-        packages_config_count = 0
-        pom_xml_count = 0
-        gradle_count = 0
-        gradle_count = 0
-        
-        # Look for package.json files (JavaScript/Node.js)
-        for path, info in file_manifest.items():
-            path_str = str(path)
-            # Check if info is a dictionary or an object with is_binary attribute
-            is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('package.json') and not is_binary:
-                package_json_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Check for dependencies section with more flexible pattern matching
-                        if '"dependencies"' in content or '"devDependencies"' in content:
-                            # Try to parse as JSON first (most reliable)
-                            try:
-                                package_data = json.loads(content)
-                                # Process dependencies
-                                if "dependencies" in package_data and isinstance(package_data["dependencies"], dict):
-                                    for dep_name, dep_version in package_data["dependencies"].items():
-                                        if isinstance(dep_version, str):
-                                            dependencies[f"npm:{dep_name}@{dep_version}"] += 1
-                                # Process devDependencies
-                                if "devDependencies" in package_data and isinstance(package_data["devDependencies"], dict):
-                                    for dep_name, dep_version in package_data["devDependencies"].items():
-                                        if isinstance(dep_version, str):
-                                            dependencies[f"npm-dev:{dep_name}@{dep_version}"] += 1
-                            except json.JSONDecodeError:
-                                # Fallback to regex if JSON parsing fails
-                                # Extract dependencies section
-                                deps_match = re.search(r'"dependencies"\s*:\s*{([^}]+)}', content)
-                                if deps_match:
-                                    deps_str = deps_match.group(1)
-                                    # Extract each dependency
-                                    for dep_match in re.finditer(r'"([^"]+)"\s*:\s*"([^"]+)"', deps_str):
-                                        dep_name = dep_match.group(1)
-                                        dep_version = dep_match.group(2)
-                                        dependencies[f"npm:{dep_name}@{dep_version}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing package.json at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing package.json at {path}: {e}")
-        
-        # Look for requirements.txt files (Python)
-        for path, info in file_manifest.items():
-            path_str = str(path)
-            # Check if info is a dictionary or an object with is_binary attribute
-            is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('requirements.txt') and not is_binary:
-                requirements_txt_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Extract each dependency
-                        for line in content.split('\n'):
-                            line = line.strip()
-                            if line and not line.startswith('#'):
-                                dependencies[f"python:{line}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing requirements.txt at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing requirements.txt at {path}: {e}")
-        
-        # Look for .csproj files (C#)
-        for path, info in file_manifest.items():
-            path_str = str(path)
-            # Check if info is a dictionary or an object with is_binary attribute
-            is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('.csproj') and not is_binary:
-                csproj_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Extract PackageReference elements
-                        for match in re.finditer(r'<PackageReference\s+Include="([^"]+)"\s+Version="([^"]+)"', content):
-                            package_name = match.group(1)
-                            version = match.group(2)
-                            dependencies[f"nuget:{package_name}@{version}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing .csproj at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing .csproj at {path}: {e}")
-        
-        # Look for packages.config files (C#)
-        for path, info in file_manifest.items():
-            path_str = str(path)
-            # Check if info is a dictionary or an object with is_binary attribute
-            is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('packages.config') and not is_binary:
-                packages_config_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Extract package elements
-                        for match in re.finditer(r'<package\s+id="([^"]+)"\s+version="([^"]+)"', content):
-                            package_name = match.group(1)
-                            version = match.group(2)
-                            dependencies[f"nuget:{package_name}@{version}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing packages.config at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing packages.config at {path}: {e}")
-        
-        # Look for pom.xml files (Java/Maven)
-        for path, info in file_manifest.items():
-            path_str = str(path)
-            # Check if info is a dictionary or an object with is_binary attribute
-            is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('pom.xml') and not is_binary:
-                pom_xml_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Extract dependency elements
-                        for match in re.finditer(r'<dependency>\s*<groupId>([^<]+)</groupId>\s*<artifactId>([^<]+)</artifactId>\s*<version>([^<]+)</version>', content, re.DOTALL):
-                            group_id = match.group(1).strip()
-                            artifact_id = match.group(2).strip()
-                            version = match.group(3).strip()
-                            dependencies[f"maven:{group_id}:{artifact_id}@{version}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing pom.xml at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing pom.xml at {path}: {e}")
+        file_counts: Counter = Counter()
         
-        # Look for build.gradle files (Java/Gradle)
+        # Scan the manifest once, skipping anything that is not a known dependency file
         for path, info in file_manifest.items():
             path_str = str(path)
+            if not path_str.endswith(DEPENDENCY_FILE_NAMES):
+                continue
             # Check if info is a dictionary or an object with is_binary attribute
             is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('build.gradle') and not is_binary:
-                gradle_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Extract implementation/compile dependencies
-                        for match in re.finditer(r'(implementation|compile)\s+[\'"]([^:\'"]*)(?::([^:\'"]*))?(?::([^\'"]*))?(:[^\'"]*)?[\'"]', content):
-                            dep_type = match.group(1)
-                            group = match.group(2) if match.group(2) else ""
-                            artifact = match.group(3) if match.group(3) else ""
-                            version = match.group(4) if match.group(4) else ""
-                            if artifact:
-                                dependencies[f"gradle:{group}:{artifact}@{version}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing build.gradle at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing build.gradle at {path}: {e}")
-        
-        # Look for build.gradle.kts files (Kotlin DSL)
-        for path, info in file_manifest.items():
-            path_str = str(path)
-            # Check if info is a dictionary or an object with is_binary attribute
-            is_binary = info.get('is_binary', False) if isinstance(info, dict) else getattr(info, 'is_binary', False)
-            if path_str.endswith('build.gradle.kts') and not is_binary:
-                gradle_count += 1
-                try:
-                    # Get content from either a dictionary or an object
-                    content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
-                    if content:
-                        # Check if content is a string
-                        if not isinstance(content, str):
-                            logging.warning(f"Content for {path} is not a string, but {type(content)}")
-                            continue
-                            
-                        # Extract implementation/compile dependencies
-                        for match in re.finditer(r'(implementation|compile)\([\'"](.*?)[\'"]', content):
-                            dep_type = match.group(1)
-                            dep_string = match.group(2)
-                            dependencies[f"gradle-kts:{dep_string}"] += 1
-                except Exception as e:
-                    logging.warning(f"Error parsing build.gradle.kts at {path}: {e}")
-                    logging.warning(f"Exception type: {type(e)}")
-                    logging.warning(f"Exception traceback: {traceback.format_exc()}")
-                    if debug:
-                        print(f"Error parsing build.gradle.kts at {path}: {e}")
+            if is_binary:
+                continue
+            
+            # Resolve the suffix and its parser together in one pass over the handlers
+            for file_kind, parser in _DEPENDENCY_HANDLERS:
+                if path_str.endswith(file_kind):
+                    break
+            file_counts[file_kind] += 1
+            try:
+                # Get content from either a dictionary or an object
+                content = info.get('content', '') if isinstance(info, dict) else getattr(info, 'content', '')
+                if not content:
+                    continue
+                # Check if content is a string
+                if not isinstance(content, str):
+                    logging.warning(f"Content for {path} is not a string, but {type(content)}")
+                    continue
+                
+                parser(content, dependencies)
+            except Exception as e:
+                logging.warning(f"Error parsing {file_kind} at {path}: {e}")
+                logging.warning(f"Exception type: {type(e)}")
+                logging.warning(f"Exception traceback: {traceback.format_exc()}")
+                if debug:
+                    print(f"Error parsing {file_kind} at {path}: {e}")
         
-        logging.debug(f"Processed {package_json_count} package.json, {requirements_txt_count} requirements.txt, "
-                     f"{csproj_count} .csproj, {packages_config_count} packages.config, "
-                     f"{pom_xml_count} pom.xml, and {gradle_count} build.gradle files")
+        gradle_count = file_counts['build.gradle'] + file_counts['build.gradle.kts']
+        logging.debug("Processed %d package.json, %d requirements.txt, %d .csproj, %d packages.config, "
+                      "%d pom.xml, and %d build.gradle files",
+                      file_counts['package.json'], file_counts['requirements.txt'], file_counts['.csproj'],
+                      file_counts['packages.config'], file_counts['pom.xml'], gradle_count)
         
         # Format the dependencies as a string
         if dependencies:
-            result = "Detected dependencies:\n"
-            for dep, count in sorted(dependencies.items(), key=lambda x: (-x[1], x[0])):
-                result += f"- {dep}\n"
-            logging.debug(f"Found {len(dependencies)} unique dependencies")
-            return result
+            lines = ["Detected dependencies:"]
+            lines.extend(f"- {dep}" for dep, _ in sorted(dependencies.items(), key=lambda x: (-x[1], x[0])))
+            result = '\n'.join(lines) + '\n'
+            logging.debug("Found %d unique dependencies", len(dependencies))
         else:
             logging.debug("No dependencies detected")
-            return "No dependencies detected."
+            result = "No dependencies detected."
+        _store_cached_result(cache_key, result)
+        return result
     except Exception as e:
         logging.error(f"Error finding common dependencies: {e}")
         if debug:
@@ -430,24 +417,28 @@ def identify_key_components(file_manifest: Dict[str, Dict], debug: bool = False,
         A formatted string listing key components
     """
     logging.debug("Identifying key components")
+    cache_key = _manifest_cache_key('identify_key_components', file_manifest, max_components)
+    cached = _get_cached_result(cache_key)
+    if cached is not None:
+        return cached
     try:
-        # Group files by directory
-        directories = defaultdict(list)
-        for path in file_manifest.keys():
-            directory = str(Path(path).parent)
-            if directory == '.':
-                directory = 'root'
-            directories[directory].append(path)
+        # Count files per directory
+        directory_counts: Counter = Counter()
+        for path in file_manifest:
+            path_str = str(path)
+            separator = max(path_str.rfind('/'), path_str.rfind('\\'))
+            directory_counts[path_str[:separator] if separator > 0 else 'root'] += 1
         
-        # Sort directories by number of files
-        sorted_dirs = sorted(directories.items(), key=lambda x: len(x[1]), reverse=True)
+        # Select the directories with the most files (ties keep manifest order)
+        top_dirs = heapq.nlargest(max_components, directory_counts.items(), key=lambda x: x[1])
         
         # Format the key components as a string
-        result = "Key components:\n"
-        for directory, files in sorted_dirs[:max_components]:
-            result += f"- {directory} ({len(files)} files)\n"
+        lines = ["Key components:"]
+        lines.extend(f"- {directory} ({count} files)" for directory, count in top_dirs)
+        result = '\n'.join(lines) + '\n'
         
-        logging.debug(f"Identified {min(len(sorted_dirs), max_components)} key components out of {len(sorted_dirs)} directories")
+        logging.debug("Identified %d key components out of %d directories", len(top_dirs), len(directory_counts))
+        _store_cached_result(cache_key, result)
         return result
     except Exception as e:
         logging.error(f"Error identifying key components: {e}")
@@ -455,6 +446,57 @@ def identify_key_components(file_manifest: Dict[str, Dict], debug: bool = False,
             print(f"Error identifying key components: {e}")
         return "Error identifying key components"
 
+def format_component_summaries(file_manifest: Dict[str, Dict], debug: bool = False, files_per_component: int = DEFAULT_FILES_PER_COMPONENT) -> str:
+    """
+    Format a representative sample of file summaries grouped by directory.
+    
+    Args:
+        file_manifest: Dictionary mapping file paths to file information
+        debug: Whether to print debug information
+        files_per_component: Maximum number of files to include per directory
+        
+    Returns:
+        A formatted string with the summaries of the files in each component
+    """
+    logging.debug("Formatting component summaries")
+    cache_key = _manifest_cache_key('format_component_summaries', file_manifest, files_per_component)
+    cached = _get_cached_result(cache_key)
+    if cached is not None:
+        return cached
+    try:
+        # Categorize summarized, non-binary files by directory/component
+        file_by_component: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for path, info in file_manifest.items():
+            if isinstance(info, dict):
+                summary = info.get('summary')
+                is_binary = info.get('is_binary', False)
+            else:
+                summary = getattr(info, 'summary', None)
+                is_binary = getattr(info, 'is_binary', False)
+            if summary and not is_binary:
+                # Plain string split instead of Path(path).parent; manifest keys may use either separator
+                path_str = str(path)
+                separator = max(path_str.rfind('/'), path_str.rfind('\\'))
+                directory = path_str[:separator] if separator > 0 else '.'
+                file_by_component[directory].append((path, summary))
+        
+        file_summaries = []
+        for directory, files in file_by_component.items():
+            file_summaries.append(f"## Component: {directory}")
+            
+            # Longer summaries are taken as more important (ties keep manifest order)
+            top_files = heapq.nlargest(files_per_component, files, key=lambda x: len(x[1]))
+            file_summaries.extend(f"File: {path}\nSummary: {summary}" for path, summary in top_files)
+        
+        result = "\n\n".join(file_summaries)
+        _store_cached_result(cache_key, result)
+        return result
+    except Exception as e:
+        logging.error(f"Error formatting component summaries: {e}")
+        if debug:
+            print(f"Error formatting component summaries: {e}")
+        return ""
+
 def get_default_order(core_files: Dict[str, Dict], resource_files: Dict[str, Dict]) -> List[str]:
     """
     Get a sensible default order when LLM ordering fails.
@@ -467,15 +509,21 @@ def get_default_order(core_files: Dict[str, Dict], resource_files: Dict[str, Dic
         A list of file paths in a sensible order
     """
     logging.debug("Generating default file order")
-    # Start with configuration files
-    config_files = [p for p in core_files if p.endswith(('.json', '.config', '.settings'))]
-    # Then other core files
-    other_files = [p for p in core_files if p not in config_files]
-    # End with resource files
-    resource_list = list(resource_files.keys())
-    
-    logging.debug(f"Default order: {len(config_files)} config files, {len(other_files)} other files, {len(resource_list)} resource files")
-    return config_files + other_files + resource_list
+    # Start with configuration files, then other core files
+    config_files: List[str] = []
+    other_files: List[str] = []
+    for path in core_files:
+        if path.endswith(CONFIG_FILE_EXTENSIONS):
+            config_files.append(path)
+        else:
+            other_files.append(path)
+    logging.debug("Default order: %d config files, %d other files, %d resource files",
+                  len(config_files), len(other_files), len(resource_files))
+    # Grow the config list in place rather than concatenating into new lists;
+    # resource files go at the end
+    config_files.extend(other_files)
+    config_files.extend(resource_files)
+    return config_files
 
 def fix_markdown_issues(content: str) -> str:
     """
@@ -490,6 +538,10 @@ def fix_markdown_issues(content: str) -> str:
     logging.debug("Fixing markdown formatting issues")
     if not content:
         return content
+    
+    # Nothing to fix when there are no headers and no list items
+    if '#' not in content and not _LIST_ITEM_LINE_RE.search(content):
+        return content
         
     lines = content.split('\n')
     fixed_lines = []
@@ -501,45 +553,50 @@ def fix_markdown_issues(content: str) -> str:
     fixes_applied = 0
     
     for i, line in enumerate(lines):
-        original_line = line
-        
-        # Fix headers without space after #
-        if re.match(r'^#+[^#\s]', line):
-            line = re.sub(r'^(#+)([^#\s])', r'\1 \2', line)
-            if line != original_line:
-                fixes_applied += 1
-        
-        # Track header levels for hierarchy
-        header_match = re.match(r'^(#+)\s', line)
-        if header_match:
-            level = len(header_match.group(1))
-            
-            # Ensure there's a blank line before headers (except at the start)
-            if i > 0 and fixed_lines and fixed_lines[-1].strip():
-                fixed_lines.append('')
-                fixes_applied += 1
+        # Only lines starting with '#' can be headers
+        if line.startswith('#'):
+            # Count the leading run of '#' characters
+            hashes = 1
+            line_length = len(line)
+            while hashes < line_length and line[hashes] == '#':
+                hashes += 1
             
-            # Ensure there's a blank line after headers
-            if i < len(lines) - 1 and lines[i+1].strip():
-                line = line + '\n'
+            # Fix headers without space after #
+            if hashes < line_length and not line[hashes].isspace():
+                line = line[:hashes] + ' ' + line[hashes:]
+                line_length += 1
                 fixes_applied += 1
             
-            # Check header hierarchy
-            if not header_levels or level <= header_levels[-1]:
-                header_levels.append(level)
-            elif level > header_levels[-1] + 1:
-                # Header level jumped too much, adjust it
-                old_level = level
-                level = header_levels[-1] + 1
-                line = '#' * level + line[header_match.end(1):]
-                header_levels.append(level)
-                logging.debug(f"Fixed header hierarchy: H{old_level} -> H{level}")
-                fixes_applied += 1
-            else:
-                header_levels.append(level)
+            # Track header levels for hierarchy
+            if hashes < line_length:
+                level = hashes
+                
+                # Ensure there's a blank line before headers (except at the start)
+                if i > 0 and fixed_lines and fixed_lines[-1].strip():
+                    fixed_lines.append('')
+                    fixes_applied += 1
+                
+                # Ensure there's a blank line after headers
+                if i < len(lines) - 1 and lines[i+1].strip():
+                    line = line + '\n'
+                    fixes_applied += 1
+                
+                # Check header hierarchy
+                if not header_levels or level <= header_levels[-1]:
+                    header_levels.append(level)
+                elif level > header_levels[-1] + 1:
+                    # Header level jumped too much, adjust it
+                    old_level = level
+                    level = header_levels[-1] + 1
+                    line = '#' * level + line[hashes:]
+                    header_levels.append(level)
+                    logging.debug("Fixed header hierarchy: H%d -> H%d", old_level, level)
+                    fixes_applied += 1
+                else:
+                    header_levels.append(level)
         
         # Fix list indentation
-        list_match = re.match(r'^(\s*)[-*+]\s', line)
+        list_match = _LIST_ITEM_RE.match(line)
         if list_match:
             indent = len(list_match.group(1))
             if not in_list:
@@ -550,7 +607,7 @@ def fix_markdown_issues(content: str) -> str:
                 old_indent = indent
                 new_indent = list_indent_level + 2
                 line = ' ' * new_indent + line.lstrip()
-                logging.debug(f"Fixed list indentation: {old_indent} -> {new_indent}")
+                logging.debug("Fixed list indentation: %d -> %d", old_indent, new_indent)
                 fixes_applied += 1
         elif line.strip() and in_list:
             in_list = False
@@ -558,11 +615,37 @@ def fix_markdown_issues(content: str) -> str:
         fixed_lines.append(line)
     
     result = '\n'.join(fixed_lines)
-    logging.debug(f"Applied {fixes_applied} markdown fixes")
+    logging.debug("Applied %d markdown fixes", fixes_applied)
     return result
 
+def _file_suffix(path: str) -> str:
+    """Return the file extension of a path, matching the semantics of Path.suffix."""
+    name = path[max(path.rfind('/'), path.rfind('\\')) + 1:]
+    dot = name.rfind('.')
+    if 0 < dot < len(name) - 1:
+        return name[dot:]
+    return ''
+
+@functools.lru_cache(maxsize=16)
+def _compile_vendor_patterns(vendor_patterns: Tuple[str, ...]) -> Optional[Pattern[str]]:
+    """
+    Compile vendor patterns into a single case-insensitive alternation.
+    
+    Args:
+        vendor_patterns: Regex patterns identifying vendor/resource files
+        
+    Returns:
+        A compiled pattern matching any of the vendor patterns, or None if there are none
+    """
+    if not vendor_patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in vendor_patterns), re.IGNORECASE)
+
+# Vendor regex for the default patterns, compiled once at import
+_DEFAULT_VENDOR_REGEX = _compile_vendor_patterns(tuple(DEFAULT_VENDOR_PATTERNS))
+
 def prepare_file_order_data(project_files: Dict[str, Dict], debug: bool = False,
-                           vendor_patterns: List[str] = DEFAULT_VENDOR_PATTERNS) -> Tuple[Dict[str, Dict], Dict[str, Dict], Dict[str, Dict]]:
+                           vendor_patterns: List[str] = DEFAULT_VENDOR_PATTERNS) -> Tuple[Dict[str, Dict], Dict[str, Dict], Dict[str, FileOrderInfo]]:
     """
     Prepare data for file order optimization.
     
@@ -572,7 +655,8 @@ def prepare_file_order_data(project_files: Dict[str, Dict], debug: bool = False,
         vendor_patterns: List of regex patterns to identify vendor/resource files
         
     Returns:
-        A tuple containing (core_files, resource_files, files_info)
+        A tuple containing (core_files, resource_files, files_info), where files_info
+        maps each core file path to a FileOrderInfo record
     """
     logging.debug("Preparing file order data")
     
@@ -583,8 +667,12 @@ def prepare_file_order_data(project_files: Dict[str, Dict], debug: bool = False,
     if debug:
         print("Filtering files...")
     
+    if vendor_patterns is DEFAULT_VENDOR_PATTERNS:
+        vendor_regex = _DEFAULT_VENDOR_REGEX
+    else:
+        vendor_regex = _compile_vendor_patterns(tuple(vendor_patterns))
     for path, info in project_files.items():
-        is_vendor = any(re.search(pattern, path, re.IGNORECASE) for pattern in vendor_patterns)
+        is_vendor = vendor_regex is not None and vendor_regex.search(path) is not None
         if is_vendor:
             resource_files[path] = info
         else:
@@ -597,22 +685,39 @@ def prepare_file_order_data(project_files: Dict[str, Dict], debug: bool = False,
     # Build simplified file info for core files only
     if debug:
         print("Building file information...")
-    files_info: Dict[str, Dict] = {}
+    files_info: Dict[str, FileOrderInfo] = {}
     
     for path, info in core_files.items():
-        # Get attributes with safe defaults
-        deps = getattr(info, 'dependencies', None) or []
-        exports = getattr(info, 'exports', None) or []
+        # Get attributes with safe defaults from either a dictionary or an object
+        if type(info) is FileInfo:
+            # FileInfo always defines these fields, and has no dependencies field
+            file_type = info.file_type
+            size = info.size
+            is_binary = info.is_binary
+            deps = []
+            exports = info.exports or []
+        elif isinstance(info, dict):
+            file_type = info.get('file_type')
+            size = info.get('size', 0)
+            is_binary = info.get('is_binary', False)
+            deps = info.get('dependencies') or []
+            exports = info.get('exports') or []
+        else:
+            file_type = getattr(info, 'file_type', None)
+            size = getattr(info, 'size', 0)
+            is_binary = getattr(info, 'is_binary', False)
+            deps = getattr(info, 'dependencies', None) or []
+            exports = getattr(info, 'exports', None) or []
         
-        files_info[path] = {
-            "type": info.file_type if hasattr(info, 'file_type') and info.file_type else Path(path).suffix,
-            "size": info.size if hasattr(info, 'size') else 0,
-            "is_binary": info.is_binary if hasattr(info, 'is_binary') else False,
-            "dependencies": list(deps),
-            "exports": list(exports)
-        }
+        files_info[path] = FileOrderInfo(
+            file_type or _file_suffix(str(path)),
+            size,
+            is_binary,
+            deps if isinstance(deps, list) else list(deps),
+            exports if isinstance(exports, list) else list(exports)
+        )
     
-    logging.debug(f"Prepared file order data with {len(files_info)} files")
+    logging.debug("Prepared file order data with %d files", len(files_info))
     return core_files, resource_files, files_info
 
 def process_file_order_response(content: str, core_files: Dict[str, Dict], resource_files: Dict[str, Dict], debug: bool = False) -> List[str]:
@@ -629,46 +734,58 @@ def process_file_order_response(content: str, core_files: Dict[str, Dict], resou
         A list of file paths in the extracted order
     """
     logging.debug("Processing file order response")
-    try:
-        # Try to parse as JSON first
-        result = json.loads(content)
-        if isinstance(result, dict) and "file_order" in result:
-            file_order = result["file_order"]
-            # Validate paths exist in original files
-            valid_paths = [path for path in file_order if path in core_files]
-            
-            if valid_paths:
-                if debug and "reasoning" in result:
-                    reasoning = result["reasoning"] if "reasoning" in result else ""
-                    print(f"Ordering reasoning: {reasoning[:100]}..." if len(reasoning) > 100 else reasoning)
+    # Only attempt a JSON parse when the response looks like a JSON document
+    stripped_content = content.lstrip()
+    if stripped_content.startswith(('{', '[')):
+        try:
+            result = _json_loads(stripped_content)
+            if isinstance(result, dict) and "file_order" in result:
+                file_order = result["file_order"]
+                # Validate paths exist in original files
+                valid_paths = [path for path in file_order if path in core_files]
                 
-                # Append resource files at the end
-                full_order = valid_paths + list(resource_files.keys())
-                logging.debug(f"Successfully extracted file order from JSON response with {len(valid_paths)} valid paths")
-                return full_order
-            else:
-                logging.warning("JSON response contained file_order but no valid paths")
-    except json.JSONDecodeError as e:
-        logging.debug(f"JSON parsing failed: {e}")
-    except Exception as e:
-        logging.error(f"Error processing file order response: {e}")
+                if valid_paths:
+                    if debug and "reasoning" in result:
+                        reasoning = str(result["reasoning"])
+                        print(f"Ordering reasoning: {reasoning[:100]}..." if len(reasoning) > 100 else reasoning)
+                    
+                    logging.debug("Successfully extracted file order from JSON response with %d valid paths", len(valid_paths))
+                    # Append resource files at the end, in place on the freshly built list
+                    valid_paths.extend(resource_files)
+                    return valid_paths
+                else:
+                    logging.warning("JSON response contained file_order but no valid paths")
+        except json.JSONDecodeError as e:
+            logging.debug("JSON parsing failed: %s", e)
+        except (ValueError, TypeError, RecursionError) as e:
+            # Deeply nested or otherwise unusable JSON still falls back to text extraction
+            logging.error(f"Error processing file order response: {e}")
+    else:
+        logging.debug("Response is not JSON, extracting file paths from text")
     
     # If JSON parsing fails, try to extract file paths from text
     try:
-        lines = content.split('\n')
         file_paths = []
-        for line in lines:
-            # Look for file paths in the response
-            for path in core_files.keys():
-                if path in line:
+        if core_files:
+            # Match all known paths in a single scan, preferring the longest path at each position
+            path_pattern = re.compile('|'.join(
+                re.escape(path) for path in sorted(core_files, key=len, reverse=True)
+            ))
+            seen_paths = set()
+            for match in path_pattern.finditer(content):
+                path = match.group(0)
+                if path not in seen_paths:
+                    seen_paths.add(path)
                     file_paths.append(path)
-                    break
+                    # Stop scanning once every core file has been found
+                    if len(file_paths) == len(core_files):
+                        break
         
         if file_paths:
-            # Append resource files at the end
-            full_order = file_paths + list(resource_files.keys())
-            logging.debug(f"Extracted {len(file_paths)} file paths from text response")
-            return full_order
+            logging.debug("Extracted %d file paths from text response", len(file_paths))
+            # Append resource files at the end, in place on the freshly built list
+            file_paths.extend(resource_files)
+            return file_paths
         else:
             logging.warning("Could not extract any file paths from text response")
     except Exception as e:
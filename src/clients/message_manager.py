@@ -1,9 +1,254 @@
-from typing import Dict, List, final, TypeVar
+from typing import Any, Dict, Final, List, Optional, Protocol, Tuple, final
+import functools
 import json
 import logging
 
-# Type for token counter objects
-TokenCounter = TypeVar('TokenCounter')
+# orjson is an optional, faster JSON serializer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class TokenCounter(Protocol):
+    """Interface of the token counter used by check_and_truncate_messages."""
+    
+    def will_exceed_limit(self, text_or_messages: Any, model_name: Optional[str] = None) -> Tuple[bool, int]: ...
+    
+    def handle_oversized_input(self, text: str, target_percentage: Optional[float] = None) -> str: ...
+    
+    def count_message_tokens(self, messages: List[Dict[str, str]]) -> int: ...
+    
+    def get_token_limit(self, model_name: Optional[str] = None) -> int: ...
+    
+    def truncate_text(self, text: str, max_tokens: Optional[int] = None) -> str: ...
+
+# Static system prompts. These never interpolate project data, so every request of a given
+# kind starts with a byte-identical prefix that provider-side prompt caches can reuse.
+# Project-specific context (structure, technologies, components) goes into the user message.
+_MARKDOWN_RULES: Final[str] = """Analyze in English and ensure all responses are in English.
+Use proper markdown formatting:
+- Ensure headers follow proper hierarchy (H1 → H2 → H3)
+- Use consistent list indentation (multiples of 2 spaces)
+- Add blank lines before headers"""
+
+_PROJECT_OVERVIEW_SYSTEM: Final[str] = f"""You are a technical documentation expert. Use the project structure and detected
+technologies provided in the request to describe the project.
+
+{_MARKDOWN_RULES}"""
+
+_COMPONENT_RELATIONSHIP_SYSTEM: Final[str] = f"""You are a technical documentation expert analyzing the architecture of a codebase.
+
+IMPORTANT INSTRUCTION: ONLY discuss technologies and patterns that are explicitly 
+evidenced in the Detected Technologies section of the request. DO NOT assume or infer the
+presence of any framework, library, or architecture that is not directly observable
+in the codebase. If the technology stack is unclear, acknowledge the limitations
+rather than making assumptions.
+
+{_MARKDOWN_RULES}"""
+
+_ARCHITECTURE_SYSTEM: Final[str] = """You are a technical documentation expert. Create comprehensive architecture documentation for this project.
+        
+Include the following sections:
+1. Overview - A high-level description of the project architecture
+2. Project Structure - Include the provided structure as a code block
+3. Component Diagram - Create a mermaid flowchart diagram showing the main components and their relationships
+4. Data Flow - Describe how data flows through the system
+5. Key Technologies - List and explain the technologies used
+6. Design Patterns - Identify any design patterns used in the project
+
+Use proper markdown formatting with appropriate headers and code blocks.
+For the Component Diagram, use mermaid.js flowchart syntax like this:
+```mermaid
+flowchart TD
+    A[Component A] --> B[Component B]
+    A --> C[Component C]
+    B --> D[Component D]
+    C --> D
+```
+
+Analyze the project structure to identify the main components and their relationships."""
+
+_ENHANCE_DOCUMENTATION_SYSTEM: Final[str] = """You are a technical documentation expert specializing in {doc_type} files.
+
+Your task is to enhance the existing {doc_type} file by:
+1. Preserving valuable information from the existing content
+2. Reorganizing the document structure for better clarity and flow
+3. Removing outdated, redundant, or incorrect information
+4. Adding missing information based on the repository analysis
+5. Ensuring proper markdown formatting with consistent header hierarchy
+6. Maintaining code snippets and examples, updating them only if incorrect
+7. Maintaining the original tone and style where appropriate
+
+Return a completely restructured document that represents the best possible documentation for this codebase.
+"""
+
+# Enhancement system prompts pre-rendered for the documents the generators enhance
+_ENHANCE_DOCUMENTATION_SYSTEMS: Final[Dict[str, str]] = {
+    doc_type: _ENHANCE_DOCUMENTATION_SYSTEM.format(doc_type=doc_type)
+    for doc_type in ("README.md", "CONTRIBUTING.md", "ARCHITECTURE.md")
+}
+
+_FILE_SUMMARY_SYSTEM: Final[str] = """You are a code documentation expert. Analyze the provided code file and create a clear, 
+concise summary that explains:
+1. The purpose and functionality of the file
+2. Key components, classes, or functions
+3. Important algorithms or patterns used
+4. How this file relates to the overall project
+5. Any notable dependencies or imports
+6. Use proper markdown formatting with consistent indentation"""
+
+_USAGE_GUIDE_SYSTEM: Final[str] = """You are a technical documentation expert. Create clear usage instructions based on the project structure."""
+
+_CONTRIBUTING_GUIDE_SYSTEM: Final[str] = """You are a technical documentation expert. Create clear contributing guidelines based on the project structure."""
+
+_LICENSE_INFO_SYSTEM: Final[str] = """You are a technical documentation expert. Create clear license information based on the project structure."""
+
+_FILE_ORDER_SYSTEM: Final[str] = """Determine the optimal order for analyzing files in a codebase.
+        Follow these rules:
+        1. Configuration files first (e.g., appsettings.json)
+        2. Core infrastructure and utilities next
+        3. Base classes before implementations
+        4. Simpler files before complex ones
+        5. Respect dependencies (if A depends on B, process B first)
+        6. Always respond in English
+        
+        IMPORTANT: Return your response as a JSON object with a "file_order" array containing the file paths in the optimal order.
+        Example: {"file_order": ["config.json", "utils.py", "main.py"], "reasoning": "Config files first, then utilities, then main application code."}"""
+
+def _require_non_empty_strings(**fields: str) -> None:
+    """Raise ValueError for the first field that is not a non-empty string.
+    
+    Field names become the message label, e.g. project_structure ->
+    "Project structure must be a non-empty string".
+    """
+    for name, value in fields.items():
+        # isspace() is False for "" and avoids building a stripped copy of large inputs
+        if not isinstance(value, str) or not value or value.isspace():
+            raise ValueError(f"{name.replace('_', ' ').capitalize()} must be a non-empty string")
+
+# User message builders. Prompts embedding the same project data are requested more than
+# once per run (e.g. overview fallbacks), so the rendered strings are memoized; returning the
+# same string object also makes downstream token-count cache lookups cheap.
+@functools.lru_cache(maxsize=32)
+def _build_project_overview_user(project_structure: str, tech_report: str, template_content: str) -> str:
+    """Render the user message for project overview requests."""
+    return f"""Project Structure:
+{project_structure}
+
+Detected Technologies:
+{tech_report}
+
+{template_content}"""
+
+@functools.lru_cache(maxsize=32)
+def _build_component_relationship_user(project_structure: str, tech_report: str) -> str:
+    """Render the user message for component relationship requests."""
+    return f"""Project Structure:
+{project_structure}
+
+Detected Technologies:
+{tech_report}
+
+Analyze how the major components in this project interact with each other.
+
+Include:
+- Main data/control flow
+- Key dependencies
+- Important interfaces
+- Notable design patterns
+
+Focus on high-level architectural relationships that are ACTUALLY present in the code,
+not what you think should be there based on common patterns."""
+
+@functools.lru_cache(maxsize=32)
+def _build_architecture_user(project_structure: str, key_components: str, tech_report: str) -> str:
+    """Render the user message for architecture requests."""
+    return f"""Based on the following project information, create detailed architecture documentation.
+
+Project Structure:
+```
+{project_structure}
+```
+
+Key Components:
+{key_components}
+
+Technologies:
+{tech_report}
+
+Please include a mermaid flowchart diagram showing the relationships between key components."""
+
+@functools.lru_cache(maxsize=32)
+def _build_enhance_documentation_user(existing_content: str, project_structure: str, key_components: str, tech_report: str, doc_type: str) -> str:
+    """Render the user message for enhance documentation requests."""
+    return f"""Project Structure:
+{project_structure}
+
+Key Components:
+{key_components}
+
+Detected Technologies:
+{tech_report}
+
+Here is the existing {doc_type} content:
+
+{existing_content}
+
+Please enhance this document by intelligently combining the existing content with new insights from the repository analysis.
+Create the best possible documentation that accurately represents the codebase.
+"""
+
+@functools.lru_cache(maxsize=32)
+def _build_usage_guide_user(project_structure: str, tech_report: str) -> str:
+    """Render the user message for usage guide requests."""
+    return f"""Based on the project structure and dependencies, generate a usage guide.
+        
+Project Structure:
+{project_structure}
+
+Dependencies:
+{tech_report}
+
+Please provide clear instructions for:
+1. Basic usage examples
+2. Common operations
+3. Configuration options
+4. Troubleshooting tips
+
+Use proper markdown formatting with clear section headers."""
+
+@functools.lru_cache(maxsize=32)
+def _build_contributing_guide_user(project_structure: str) -> str:
+    """Render the user message for contributing guide requests."""
+    return f"""Based on the project structure, generate a contributing guide.
+        
+Project Structure:
+{project_structure}
+
+Please provide clear guidelines for:
+1. Setting up the development environment
+2. Code style and standards
+3. Testing procedures
+4. Pull request process
+5. Issue reporting
+
+Use proper markdown formatting with clear section headers."""
+
+@functools.lru_cache(maxsize=32)
+def _build_license_info_user(project_structure: str) -> str:
+    """Render the user message for license information requests."""
+    return f"""Based on the project structure, generate license information.
+        
+Project Structure:
+{project_structure}
+
+Please provide:
+1. License type (if detectable)
+2. Brief explanation of the license
+3. Any copyright notices found
+
+If no license information is found, provide a generic statement about licensing.
+Use proper markdown formatting."""
 
 @final
 class MessageManager:
@@ -45,10 +290,7 @@ class MessageManager:
             ```
         """
         # Validate inputs
-        if not isinstance(system_content, str) or not system_content.strip():
-            raise ValueError("System content must be a non-empty string")
-        if not isinstance(user_content, str) or not user_content.strip():
-            raise ValueError("User content must be a non-empty string")
+        _require_non_empty_strings(system_content=system_content, user_content=user_content)
             
         return [
             {"role": "system", "content": system_content},
@@ -89,7 +331,7 @@ class MessageManager:
         logging.debug(f"template_content type: {type(template_content)}, length: {len(template_content) if isinstance(template_content, str) else 'N/A'}")
         
         # Validate inputs
-        if not isinstance(project_structure, str) or not project_structure.strip():
+        if not isinstance(project_structure, str) or not project_structure or project_structure.isspace():
             logging.error("Project structure validation failed")
             raise ValueError("Project structure must be a non-empty string")
         
@@ -98,22 +340,12 @@ class MessageManager:
             logging.warning(f"tech_report is not a string, it's a {type(tech_report)}")
             tech_report = "No dependencies detected."
         
-        if not isinstance(template_content, str) or not template_content.strip():
+        if not isinstance(template_content, str) or not template_content or template_content.isspace():
             logging.error("Template content validation failed")
             raise ValueError("Template content must be a non-empty string")
-        system_content = f"""Project Structure:
-{project_structure}
-
-Detected Technologies:
-{tech_report}
-
-Analyze in English and ensure all responses are in English.
-Use proper markdown formatting:
-- Ensure headers follow proper hierarchy (H1 → H2 → H3)
-- Use consistent list indentation (multiples of 2 spaces)
-- Add blank lines before headers"""
+        user_content = _build_project_overview_user(project_structure, tech_report, template_content)
         
-        return MessageManager.create_system_user_messages(system_content, template_content)
+        return MessageManager.create_system_user_messages(_PROJECT_OVERVIEW_SYSTEM, user_content)
     
     @staticmethod
     def get_component_relationship_messages(project_structure: str, tech_report: str) -> List[Dict[str, str]]:
@@ -141,40 +373,10 @@ Use proper markdown formatting:
             ValueError: If any of the input parameters are empty or not strings
         """
         # Validate inputs
-        if not isinstance(project_structure, str) or not project_structure.strip():
-            raise ValueError("Project structure must be a non-empty string")
-        if not isinstance(tech_report, str) or not tech_report.strip():
-            raise ValueError("Tech report must be a non-empty string")
-        system_content = f"""Project Structure:
-{project_structure}
-
-Detected Technologies:
-{tech_report}
-
-IMPORTANT INSTRUCTION: ONLY discuss technologies and patterns that are explicitly 
-evidenced in the Detected Technologies section above. DO NOT assume or infer the
-presence of any framework, library, or architecture that is not directly observable
-in the codebase. If the technology stack is unclear, acknowledge the limitations
-rather than making assumptions.
-
-Analyze in English and ensure all responses are in English.
-Use proper markdown formatting:
-- Ensure headers follow proper hierarchy (H1 → H2 → H3)
-- Use consistent list indentation (multiples of 2 spaces)
-- Add blank lines before headers"""
+        _require_non_empty_strings(project_structure=project_structure, tech_report=tech_report)
+        user_content = _build_component_relationship_user(project_structure, tech_report)
         
-        user_content = """Analyze how the major components in this project interact with each other.
-
-Include:
-- Main data/control flow
-- Key dependencies
-- Important interfaces
-- Notable design patterns
-
-Focus on high-level architectural relationships that are ACTUALLY present in the code,
-not what you think should be there based on common patterns."""
-        
-        return MessageManager.create_system_user_messages(system_content, user_content)
+        return MessageManager.create_system_user_messages(_COMPONENT_RELATIONSHIP_SYSTEM, user_content)
     
     @staticmethod
     def get_file_summary_messages(prompt: str) -> List[Dict[str, str]]:
@@ -199,18 +401,8 @@ not what you think should be there based on common patterns."""
             ValueError: If the prompt is empty or not a string
         """
         # Validate input
-        if not isinstance(prompt, str) or not prompt.strip():
-            raise ValueError("Prompt must be a non-empty string")
-        system_content = """You are a code documentation expert. Analyze the provided code file and create a clear, 
-concise summary that explains:
-1. The purpose and functionality of the file
-2. Key components, classes, or functions
-3. Important algorithms or patterns used
-4. How this file relates to the overall project
-5. Any notable dependencies or imports
-6. Use proper markdown formatting with consistent indentation"""
-        
-        return MessageManager.create_system_user_messages(system_content, prompt)
+        _require_non_empty_strings(prompt=prompt)
+        return MessageManager.create_system_user_messages(_FILE_SUMMARY_SYSTEM, prompt)
     
     @staticmethod
     def get_architecture_content_messages(project_structure: str, key_components: str, tech_report: str) -> List[Dict[str, str]]:
@@ -240,50 +432,14 @@ concise summary that explains:
             ValueError: If any of the input parameters are empty or not strings
         """
         # Validate inputs
-        if not isinstance(project_structure, str) or not project_structure.strip():
-            raise ValueError("Project structure must be a non-empty string")
-        if not isinstance(key_components, str) or not key_components.strip():
-            raise ValueError("Key components must be a non-empty string")
-        if not isinstance(tech_report, str) or not tech_report.strip():
-            raise ValueError("Tech report must be a non-empty string")
-        system_content = """You are a technical documentation expert. Create comprehensive architecture documentation for this project.
-        
-Include the following sections:
-1. Overview - A high-level description of the project architecture
-2. Project Structure - Include the provided structure as a code block
-3. Component Diagram - Create a mermaid flowchart diagram showing the main components and their relationships
-4. Data Flow - Describe how data flows through the system
-5. Key Technologies - List and explain the technologies used
-6. Design Patterns - Identify any design patterns used in the project
-
-Use proper markdown formatting with appropriate headers and code blocks.
-For the Component Diagram, use mermaid.js flowchart syntax like this:
-```mermaid
-flowchart TD
-    A[Component A] --> B[Component B]
-    A --> C[Component C]
-    B --> D[Component D]
-    C --> D
-```
-
-Analyze the project structure to identify the main components and their relationships."""
+        _require_non_empty_strings(
+            project_structure=project_structure,
+            key_components=key_components,
+            tech_report=tech_report
+        )
+        user_content = _build_architecture_user(project_structure, key_components, tech_report)
 
-        user_content = f"""Based on the following project information, create detailed architecture documentation.
-
-Project Structure:
-```
-{project_structure}
-```
-
-Key Components:
-{key_components}
-
-Technologies:
-{tech_report}
-
-Please include a mermaid flowchart diagram showing the relationships between key components."""
-
-        return MessageManager.create_system_user_messages(system_content, user_content)
+        return MessageManager.create_system_user_messages(_ARCHITECTURE_SYSTEM, user_content)
     
     @staticmethod
     def get_enhance_documentation_messages(existing_content: str, project_structure: str,
@@ -318,46 +474,18 @@ Please include a mermaid flowchart diagram showing the relationships between key
             ValueError: If any of the input parameters are empty or not strings
         """
         # Validate inputs
-        if not isinstance(existing_content, str) or not existing_content.strip():
-            raise ValueError("Existing content must be a non-empty string")
-        if not isinstance(project_structure, str) or not project_structure.strip():
-            raise ValueError("Project structure must be a non-empty string")
-        if not isinstance(key_components, str) or not key_components.strip():
-            raise ValueError("Key components must be a non-empty string")
-        if not isinstance(tech_report, str) or not tech_report.strip():
-            raise ValueError("Tech report must be a non-empty string")
-        if not isinstance(doc_type, str) or not doc_type.strip():
-            raise ValueError("Doc type must be a non-empty string")
-        system_content = f"""You are a technical documentation expert specializing in {doc_type} files.
-        
-Project Structure:
-{project_structure}
-
-Key Components:
-{key_components}
-
-Detected Technologies:
-{tech_report}
-
-Your task is to enhance the existing {doc_type} file by:
-1. Preserving valuable information from the existing content
-2. Reorganizing the document structure for better clarity and flow
-3. Removing outdated, redundant, or incorrect information
-4. Adding missing information based on the repository analysis
-5. Ensuring proper markdown formatting with consistent header hierarchy
-6. Maintaining code snippets and examples, updating them only if incorrect
-7. Maintaining the original tone and style where appropriate
-
-Return a completely restructured document that represents the best possible documentation for this codebase.
-"""
-        
-        user_content = f"""Here is the existing {doc_type} content:
-
-{existing_content}
-
-Please enhance this document by intelligently combining the existing content with new insights from the repository analysis.
-Create the best possible documentation that accurately represents the codebase.
-"""
+        _require_non_empty_strings(
+            existing_content=existing_content,
+            project_structure=project_structure,
+            key_components=key_components,
+            tech_report=tech_report,
+            doc_type=doc_type
+        )
+        system_content = _ENHANCE_DOCUMENTATION_SYSTEMS.get(doc_type)
+        if system_content is None:
+            system_content = _ENHANCE_DOCUMENTATION_SYSTEM.format(doc_type=doc_type)
+        
+        user_content = _build_enhance_documentation_user(existing_content, project_structure, key_components, tech_report, doc_type)
         
         return MessageManager.create_system_user_messages(system_content, user_content)
     
@@ -387,29 +515,10 @@ Create the best possible documentation that accurately represents the codebase.
             ValueError: If any of the input parameters are empty or not strings
         """
         # Validate inputs
-        if not isinstance(project_structure, str) or not project_structure.strip():
-            raise ValueError("Project structure must be a non-empty string")
-        if not isinstance(tech_report, str) or not tech_report.strip():
-            raise ValueError("Tech report must be a non-empty string")
-        system_content = """You are a technical documentation expert. Create clear usage instructions based on the project structure."""
+        _require_non_empty_strings(project_structure=project_structure, tech_report=tech_report)
+        user_content = _build_usage_guide_user(project_structure, tech_report)
         
-        user_content = f"""Based on the project structure and dependencies, generate a usage guide.
-        
-Project Structure:
-{project_structure}
-
-Dependencies:
-{tech_report}
-
-Please provide clear instructions for:
-1. Basic usage examples
-2. Common operations
-3. Configuration options
-4. Troubleshooting tips
-
-Use proper markdown formatting with clear section headers."""
-        
-        return MessageManager.create_system_user_messages(system_content, user_content)
+        return MessageManager.create_system_user_messages(_USAGE_GUIDE_SYSTEM, user_content)
     
     @staticmethod
     def get_contributing_guide_messages(project_structure: str) -> List[Dict[str, str]]:
@@ -435,25 +544,10 @@ Use proper markdown formatting with clear section headers."""
             ValueError: If the project_structure is empty or not a string
         """
         # Validate input
-        if not isinstance(project_structure, str) or not project_structure.strip():
-            raise ValueError("Project structure must be a non-empty string")
-        system_content = """You are a technical documentation expert. Create clear contributing guidelines based on the project structure."""
-        
-        user_content = f"""Based on the project structure, generate a contributing guide.
+        _require_non_empty_strings(project_structure=project_structure)
+        user_content = _build_contributing_guide_user(project_structure)
         
-Project Structure:
-{project_structure}
-
-Please provide clear guidelines for:
-1. Setting up the development environment
-2. Code style and standards
-3. Testing procedures
-4. Pull request process
-5. Issue reporting
-
-Use proper markdown formatting with clear section headers."""
-        
-        return MessageManager.create_system_user_messages(system_content, user_content)
+        return MessageManager.create_system_user_messages(_CONTRIBUTING_GUIDE_SYSTEM, user_content)
     
     @staticmethod
     def get_license_info_messages(project_structure: str) -> List[Dict[str, str]]:
@@ -479,24 +573,10 @@ Use proper markdown formatting with clear section headers."""
             ValueError: If the project_structure is empty or not a string
         """
         # Validate input
-        if not isinstance(project_structure, str) or not project_structure.strip():
-            raise ValueError("Project structure must be a non-empty string")
-        system_content = """You are a technical documentation expert. Create clear license information based on the project structure."""
-        
-        user_content = f"""Based on the project structure, generate license information.
-        
-Project Structure:
-{project_structure}
-
-Please provide:
-1. License type (if detectable)
-2. Brief explanation of the license
-3. Any copyright notices found
-
-If no license information is found, provide a generic statement about licensing.
-Use proper markdown formatting."""
+        _require_non_empty_strings(project_structure=project_structure)
+        user_content = _build_license_info_user(project_structure)
         
-        return MessageManager.create_system_user_messages(system_content, user_content)
+        return MessageManager.create_system_user_messages(_LICENSE_INFO_SYSTEM, user_content)
     
     @staticmethod
     def get_file_order_messages(files_info: dict) -> List[Dict[str, str]]:
@@ -506,7 +586,8 @@ Use proper markdown formatting."""
         files in a codebase, based on dependencies and complexity.
         
         Args:
-            files_info: Dictionary containing information about the files to order
+            files_info: Dictionary containing information about the files to order.
+                Values may be dictionaries or namedtuple records such as FileOrderInfo.
             
         Returns:
             A list of message dictionaries formatted for LLM API requests
@@ -525,24 +606,29 @@ Use proper markdown formatting."""
         # Validate input
         if not isinstance(files_info, dict):
             raise ValueError("Files info must be a dictionary")
-        system_content = """Determine the optimal order for analyzing files in a codebase.
-        Follow these rules:
-        1. Configuration files first (e.g., appsettings.json)
-        2. Core infrastructure and utilities next
-        3. Base classes before implementations
-        4. Simpler files before complex ones
-        5. Respect dependencies (if A depends on B, process B first)
-        6. Always respond in English
-        
-        IMPORTANT: Return your response as a JSON object with a "file_order" array containing the file paths in the optimal order.
-        Example: {"file_order": ["config.json", "utils.py", "main.py"], "reasoning": "Config files first, then utilities, then main application code."}"""
-        
-        user_content = json.dumps({
-            "files": files_info,
+        # Namedtuple records would otherwise serialize as bare JSON arrays
+        files = {
+            path: info._asdict() if hasattr(info, '_asdict') else info
+            for path, info in files_info.items()
+        }
+        payload = {
+            "files": files,
             "task": "Analyze these files and return them in optimal processing order"
-        }, indent=2)
-        
-        return MessageManager.create_system_user_messages(system_content, user_content)
+        }
+        # Sort keys so equivalent inputs always produce byte-identical payloads,
+        # whatever order the filesystem listed the files in. The payload is only read
+        # by the model, so it is emitted compactly rather than pretty-printed.
+        user_content = None
+        if orjson is not None:
+            try:
+                user_content = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS).decode()
+            except TypeError:
+                # orjson rejects some inputs json accepts (e.g. non-string keys or int overflow)
+                pass
+        if user_content is None:
+            user_content = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+        
+        return MessageManager.create_system_user_messages(_FILE_ORDER_SYSTEM, user_content)
     
     @staticmethod
     def check_and_truncate_messages(messages: List[Dict[str, str]], token_counter: TokenCounter, model_name: str) -> List[Dict[str, str]]:
@@ -585,52 +671,70 @@ Use proper markdown formatting."""
         ):
             raise ValueError("Messages must be a list of dictionaries with 'role' and 'content' keys")
             
-        if not hasattr(token_counter, "will_exceed_limit") or not callable(getattr(token_counter, "will_exceed_limit")):
+        # A single attribute lookup stands in for a hasattr/getattr/callable probe
+        will_exceed_limit = getattr(token_counter, "will_exceed_limit", None)
+        if not callable(will_exceed_limit):
             raise TypeError("token_counter must have a 'will_exceed_limit' method")
             
         # Check if we're already under the limit
-        will_exceed, token_count = token_counter.will_exceed_limit(messages, model_name)
+        will_exceed, token_count = will_exceed_limit(messages, model_name)
         
         if not will_exceed:
             return messages
         
         # If we exceed the limit, we need to truncate the user message content
-        # System message is usually shorter and more important for context
-        truncated_messages = messages.copy()
+        # System message is usually shorter and more important for context.
+        # The list and the changed messages are copied on first change, so the
+        # caller's messages are never modified.
+        truncated_messages = messages
+        
+        # Find the user messages once; only they are candidates for truncation
+        user_indices = [i for i, message in enumerate(messages) if message["role"] == "user"]
         
         # STRATEGY 1: Intelligent content reduction
         # This preserves important parts of the content while reducing overall size
-        for i, message in enumerate(truncated_messages):
-            if message["role"] == "user":
-                # Use the intelligent reduction method that tries to preserve meaning
-                truncated_content = token_counter.handle_oversized_input(
-                    message["content"],
-                    target_percentage=0.8  # Target 80% of model's limit
-                )
-                truncated_messages[i]["content"] = truncated_content
-                
-                # Check if we're now under the limit
-                still_exceeds, new_count = token_counter.will_exceed_limit(truncated_messages, model_name)
-                if not still_exceeds:
-                    logging.info(f"Intelligently reduced message from {token_count} to {new_count} tokens")
-                    return truncated_messages
+        for i in user_indices:
+            message = messages[i]
+            content = message["content"]
+            # Use the intelligent reduction method that tries to preserve meaning
+            truncated_content = token_counter.handle_oversized_input(
+                content,
+                target_percentage=0.8  # Target 80% of model's limit
+            )
+            if truncated_content == content:
+                # Nothing was removed, so the token count cannot have changed
+                continue
+            if truncated_messages is messages:
+                truncated_messages = list(messages)
+            truncated_messages[i] = {**message, "content": truncated_content}
+            
+            # Check if we're now under the limit
+            still_exceeds, new_count = will_exceed_limit(truncated_messages, model_name)
+            if not still_exceeds:
+                logging.info("Intelligently reduced message from %d to %d tokens", token_count, new_count)
+                return truncated_messages
         
         # STRATEGY 2: Hard truncation as last resort
         # If intelligent reduction wasn't enough, fall back to simple truncation
-        for i, message in enumerate(truncated_messages):
-            if message["role"] == "user":
-                # Calculate the effective token limit for this message
-                # We'll use 90% of the model's limit minus the tokens from other messages
-                other_messages = [m for j, m in enumerate(messages) if j != i]
-                other_tokens = token_counter.count_message_tokens(other_messages)
-                model_limit = token_counter.get_token_limit(model_name)
-                effective_limit = int(model_limit * 0.9) - other_tokens
-                
-                # Hard truncate the content to fit within the limit
-                truncated_content = token_counter.truncate_text(message["content"], effective_limit)
-                truncated_messages[i]["content"] = truncated_content
-                
-                logging.warning(f"Forced to truncate message to {effective_limit} tokens")
-                break  # Only truncate one message (the user message)
+        if user_indices:
+            # Only truncate one message (the user message)
+            i = user_indices[0]
+            message = truncated_messages[i]
+            
+            # Calculate the effective token limit for this message
+            # We'll use 90% of the model's limit minus the tokens from the other
+            # messages, counted after their intelligent reduction
+            other_messages = truncated_messages[:i] + truncated_messages[i + 1:]
+            other_tokens = token_counter.count_message_tokens(other_messages)
+            model_limit = token_counter.get_token_limit(model_name)
+            effective_limit = int(model_limit * 0.9) - other_tokens
+            
+            # Hard truncate the content to fit within the limit
+            truncated_content = token_counter.truncate_text(message["content"], effective_limit)
+            if truncated_messages is messages:
+                truncated_messages = list(messages)
+            truncated_messages[i] = {**message, "content": truncated_content}
+            
+            logging.warning("Forced to truncate message to %d tokens", effective_limit)
         
         return truncated_messages
\ No newline at end of file
@@ -18,11 +18,13 @@ from .llm_utils import (
     format_project_structure,
     find_common_dependencies,
     identify_key_components,
+    format_component_summaries,
     fix_markdown_issues,
     prepare_file_order_data,
     process_file_order_response
 )
 from ..analyzers.codebase import CodebaseAnalyzer
+from ..utils.cache import ResponseCache
 from ..utils.prompt_manager import PromptTemplate
 from ..utils.progress import ProgressTracker
 from ..utils.retry import async_retry
@@ -36,6 +38,15 @@ DEFAULT_RETRY_DELAY = 1.0
 DEFAULT_TIMEOUT = 30
 DEFAULT_TEMPERATURE = 0
 
+# Connection pool settings for the shared HTTP client
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_POOL_TIMEOUT = 30.0
+DEFAULT_POOL_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60.0,
+)
+
 class OllamaClientError(Exception):
     """Custom exception for Ollama client errors."""
     pass
@@ -80,10 +91,26 @@ class OllamaClient(BaseLLMClient):
         self.retry_delay = config.ollama.retry_delay
         self.timeout = config.ollama.timeout
         self.temperature = config.ollama.temperature
+        # How long Ollama keeps the model loaded after a request; None leaves it to the server
+        self.keep_alive = config.ollama.keep_alive
         self.debug = config.debug
         
-        # Initialize Ollama client
-        self.client = AsyncClient(host=self.base_url)
+        # Cache responses to identical requests; only deterministic output is reusable
+        if config.no_cache or self.temperature != 0:
+            self.response_cache = None
+        else:
+            # Bounded in-memory cache for this run, evicting least recently used responses
+            self.response_cache = ResponseCache(ttl=config.cache.ttl)
+        
+        # Initialize Ollama client; its underlying httpx client keeps a pool of
+        # keep-alive connections that is reused by every request. Only connecting and
+        # waiting for a pooled connection are bounded; reads and writes stay unbounded
+        # since local generations on a large context can run long
+        self.client = AsyncClient(
+            host=self.base_url,
+            limits=DEFAULT_POOL_LIMITS,
+            timeout=httpx.Timeout(None, connect=DEFAULT_CONNECT_TIMEOUT, pool=DEFAULT_POOL_TIMEOUT),
+        )
         # Initialize prompt template
         if hasattr(config, 'template_path') and config.template_path:
             self.prompt_template = PromptTemplate(config.template_path)
@@ -130,6 +157,61 @@ class OllamaClient(BaseLLMClient):
                 print(f"Initialization error: {traceback.format_exc()}")
             raise OllamaClientError(f"Failed to initialize client: {str(e)}")
 
+    @async_retry(
+        retries=DEFAULT_RETRIES,
+        delay=DEFAULT_RETRY_DELAY,
+        backoff=2.0,
+        max_delay=30.0,
+        jitter=True,
+        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
+    )
+    async def _chat(self, messages: List[Dict[str, str]], fix_markdown: bool = True) -> str:
+        """
+        Send a chat request to the selected model.
+        
+        All generation methods go through this method so that requests share
+        the same model, options, pooled HTTP client, response cache and retry
+        policy. Retrying here rather than around each generation method means
+        transient errors are retried even by methods that catch exceptions.
+        
+        Args:
+            messages: Chat messages to send
+            fix_markdown: Whether to fix markdown issues in the response. The
+                fixed content is what gets cached, so hits skip the fix.
+            
+        Returns:
+            The content of the response message
+            
+        Raises:
+            OllamaClientError: If the response has no message, so that callers
+                fall back the same way they do for other request errors
+        """
+        if self.response_cache is not None:
+            cache_key = ResponseCache.make_key(self.selected_model, self.temperature, messages, fix_markdown)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        response = await self.client.chat(
+            model=self.selected_model,
+            messages=messages,
+            options={"temperature": self.temperature},
+            keep_alive=self.keep_alive
+        )
+        if not response or 'message' not in response:
+            raise OllamaClientError("Empty or invalid response from Ollama API")
+        
+        content = response['message'].get('content', '')
+        if fix_markdown:
+            content = self._fix_markdown_issues(content)
+        if self.response_cache is not None:
+            self.response_cache.set(cache_key, content)
+        return content
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections used by the Ollama client."""
+        await self.client.close()
+
     def init_token_counter(self) -> None:
         """
         Initialize the token counter for this client.
@@ -177,14 +259,6 @@ class OllamaClient(BaseLLMClient):
             logging.error(f"Error fetching models from Ollama: {str(e)}")
             return []
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_summary(self, content: str, file_type: str = "text", file_path: str = None) -> Optional[str]:
         """
         Generate a summary for a file's content.
@@ -206,31 +280,22 @@ class OllamaClient(BaseLLMClient):
             file_info = f"File: {file_path}\nType: {file_type}\n\n" if file_path else ""
             prompt = f"{file_info}{content}"
             
-            # Check token count
-            will_exceed, token_count = self.token_counter.will_exceed_limit(prompt, self.selected_model)
+            # Check token count, skipping tokenization for prompts too short to exceed the limit
+            will_exceed = False
+            if self.token_counter.may_exceed_limit(prompt, self.selected_model):
+                will_exceed, token_count = self.token_counter.will_exceed_limit(prompt, self.selected_model)
             
             if will_exceed:
                 if self.debug:
                     print(f"Content exceeds token limit ({token_count} tokens). Truncating...")
                 prompt = self.token_counter.truncate_text(prompt)
                 
-                # Re-check after truncation
-                _, new_token_count = self.token_counter.will_exceed_limit(prompt, self.selected_model)
+                # Re-count after truncation only to report it
                 if self.debug:
+                    _, new_token_count = self.token_counter.will_exceed_limit(prompt, self.selected_model)
                     print(f"Truncated to {new_token_count} tokens")
             
-            response = await self.client.chat(
-                model=self.selected_model,
-                messages=MessageManager.get_file_summary_messages(prompt),
-                options={"temperature": self.temperature}
-            )
-            
-            if response and 'message' in response:
-                content = response['message'].get('content', '')
-                return self._fix_markdown_issues(content)
-            
-            logging.warning("Empty or invalid response from Ollama API")
-            return None
+            return await self._chat(MessageManager.get_file_summary_messages(prompt))
             
         except httpx.HTTPError as e:
             logging.error(f"HTTP error generating summary: {e}")
@@ -256,14 +321,6 @@ class OllamaClient(BaseLLMClient):
         """
         return fix_markdown_issues(content)
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_project_overview(self, file_manifest: Dict[str, Any]) -> str:
         """
         Generate project overview based strictly on observed evidence.
@@ -283,13 +340,12 @@ class OllamaClient(BaseLLMClient):
         # Get progress tracker instance
         progress_tracker = ProgressTracker.get_instance(Path("."))
         with progress_tracker.progress_bar(
+            total=1,
             desc="Generating project overview",
             bar_format='{desc} {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}',
             ncols=150
         ) as pbar:
             try:
-                update_task = asyncio.create_task(progress_tracker.update_progress_async(pbar))
-                
                 # Get detected technologies
                 tech_report = self._find_common_dependencies(file_manifest)
                 
@@ -305,22 +361,17 @@ class OllamaClient(BaseLLMClient):
                     'project_structure': self.project_structure
                 })
                 
-                response = await self.client.chat(
-                    model=self.selected_model,
-                    messages=MessageManager.get_project_overview_messages(
+                content = await self._chat(
+                    MessageManager.get_project_overview_messages(
                         self.project_structure, 
                         tech_report, 
                         template_content
-                    ),
-                    options={"temperature": self.temperature}
+                    )
                 )
                 
-                update_task.cancel()
-                content = response['message']['content']
+                pbar.update(1)
                 
-                # Fix any remaining markdown issues
-                fixed_content = self._fix_markdown_issues(content)
-                return fixed_content
+                return content
                 
             except Exception as e:
                 if self.debug:
@@ -363,14 +414,6 @@ class OllamaClient(BaseLLMClient):
         """
         self.project_structure = self._format_project_structure(file_manifest)
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_component_relationships(self, file_manifest: Dict[str, Any]) -> str:
         """
         Generate description of how components interact.
@@ -388,18 +431,14 @@ class OllamaClient(BaseLLMClient):
         # Get detected technologies first
         tech_report = self._find_common_dependencies(file_manifest)
         
-        response = await self.client.chat(
-            model=self.selected_model,
-            messages=MessageManager.get_component_relationship_messages(
+        content = await self._chat(
+            MessageManager.get_component_relationship_messages(
                 self.project_structure, 
                 tech_report
-            ),
-            options={"temperature": self.temperature}
+            )
         )
-        content = response['message']['content']
         
-        # Fix any markdown issues
-        return self._fix_markdown_issues(content)
+        return content
 
     def _identify_key_components(self, file_manifest: Dict[str, Any]) -> str:
         """
@@ -416,6 +455,21 @@ class OllamaClient(BaseLLMClient):
         """
         return identify_key_components(file_manifest, self.debug)
 
+    def _format_component_summaries(self, file_manifest: Dict[str, Any]) -> str:
+        """
+        Format a representative sample of file summaries per component.
+        
+        This method delegates to the imported format_component_summaries utility
+        function, which memoizes the result for each manifest.
+        
+        Args:
+            file_manifest: Dictionary mapping file paths to file information
+            
+        Returns:
+            str: Summaries of up to three files per directory
+        """
+        return format_component_summaries(file_manifest, self.debug)
+
     def _find_common_dependencies(self, file_manifest: Dict[str, Any]) -> str:
         """
         Extract common dependencies from file manifest.
@@ -436,7 +490,8 @@ class OllamaClient(BaseLLMClient):
         Interactive model selection.
         
         This method prompts the user to select a model from the list of
-        available models in the Ollama instance.
+        available models in the Ollama instance. If only one model is
+        available it is selected without prompting.
         
         Returns:
             str: The name of the selected model
@@ -444,13 +499,20 @@ class OllamaClient(BaseLLMClient):
         Raises:
             No exceptions are raised, but will retry until a valid selection is made
         """
+        # Nothing to choose between when only one model is installed
+        if len(self.available_models) == 1:
+            return self.available_models[0]
+        
+        # Build the menu once; it is reprinted after every invalid selection
+        model_menu = "Available Ollama models:\n" + "\n".join(
+            f"{i}. {model}" for i, model in enumerate(self.available_models, 1)
+        )
         while True:
-            print("Available Ollama models:")
-            for i, model in enumerate(self.available_models, 1):
-                print(f"{i}. {model}")
+            print(model_menu)
             
             try:
-                selection = int(input("Enter the number of the model to use: "))
+                # Read the selection in a worker thread so the event loop is not blocked
+                selection = int(await asyncio.to_thread(input, "Enter the number of the model to use: "))
                 if 1 <= selection <= len(self.available_models):
                     return self.available_models[selection - 1]
                 else:
@@ -494,13 +556,7 @@ class OllamaClient(BaseLLMClient):
             messages = MessageManager.get_file_order_messages(files_info)
             
             # Send request to Ollama
-            response = await self.client.chat(
-                model=self.selected_model,
-                messages=messages,
-                options={"temperature": self.temperature}
-            )
-            
-            content = response['message']['content']
+            content = await self._chat(messages, fix_markdown=False)
             
             # Use common utility to process response
             return process_file_order_response(content, core_files, resource_files, self.debug)
@@ -510,14 +566,6 @@ class OllamaClient(BaseLLMClient):
             logging.error(f"Error getting file order: {str(e)}", exc_info=True)
             return list(project_files.keys())
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_architecture_content(self, file_manifest: Dict[str, Any], analyzer: Any) -> str:
         """
         Generate architecture documentation content with flow diagrams.
@@ -535,13 +583,12 @@ class OllamaClient(BaseLLMClient):
         # Get progress tracker instance
         progress_tracker = ProgressTracker.get_instance(Path("."))
         with progress_tracker.progress_bar(
+            total=1,
             desc="Generating architecture documentation",
             bar_format='{desc} {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt}',
             ncols=150
         ) as pbar:
             try:
-                update_task = asyncio.create_task(progress_tracker.update_progress_async(pbar))
-                
                 # Ensure project structure is set
                 if not self.project_structure or len(self.project_structure) < 10:
                     self.set_project_structure_from_manifest(file_manifest)
@@ -554,31 +601,8 @@ class OllamaClient(BaseLLMClient):
                 # Get key components
                 key_components = self._identify_key_components(file_manifest)
                 
-                # Create a summary of file contents for context
-                file_summaries = []
-                
-                # First, categorize files by directory/component
-                file_by_component = {}
-                for path, info in file_manifest.items():
-                    if info.get('summary') and not info.get('is_binary', False):
-                        directory = str(Path(path).parent)
-                        if directory not in file_by_component:
-                            file_by_component[directory] = []
-                        file_by_component[directory].append((path, info.get('summary', 'No summary available')))
-                
-                # For each component, include a representative sample of files
-                for directory, files in file_by_component.items():
-                    # Add component header
-                    file_summaries.append(f"## Component: {directory}")
-                    
-                    # Sort files by potential importance (e.g., longer summaries might be more important)
-                    files.sort(key=lambda x: len(x[1]), reverse=True)
-                    
-                    # Take up to 3 files per component to ensure broad coverage
-                    for path, summary in files[:3]:
-                        file_summaries.append(f"File: {path}\nSummary: {summary}")
-                
-                file_summaries_text = "\n\n".join(file_summaries)
+                # Summaries of a representative sample of files per component
+                file_summaries_text = self._format_component_summaries(file_manifest)
                 
                 # Get messages from MessageManager with enhanced content
                 messages = MessageManager.get_architecture_content_messages(
@@ -593,14 +617,9 @@ class OllamaClient(BaseLLMClient):
                         messages[i]["content"] += f"\n\nFile Summaries:\n{file_summaries_text}"
                         break
                 
-                response = await self.client.chat(
-                    model=self.selected_model,
-                    messages=messages,
-                    options={"temperature": self.temperature}
-                )
+                content = await self._chat(messages, fix_markdown=False)
                 
-                update_task.cancel()
-                content = response['message']['content']
+                pbar.update(1)
                 
                 # Ensure the project structure is included in the output
                 if "```" not in content[:500]:
@@ -614,14 +633,6 @@ class OllamaClient(BaseLLMClient):
                     print(f"\nError generating architecture content: {str(e)}")
                 return "Error generating architecture documentation."
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_usage_guide(self, file_manifest: Dict[str, Any]) -> str:
         """
         Generate usage guide based on project structure.
@@ -636,33 +647,20 @@ class OllamaClient(BaseLLMClient):
             str: Generated usage guide in markdown format
         """
         try:
-            response = await self.client.chat(
-                model=self.selected_model,
-                messages=MessageManager.get_usage_guide_messages(
+            content = await self._chat(
+                MessageManager.get_usage_guide_messages(
                     self.project_structure,
                     self._find_common_dependencies(file_manifest)
-                ),
-                options={"temperature": self.temperature}
+                )
             )
             
-            content = response['message']['content']
-            
-            # Fix any markdown issues
-            return self._fix_markdown_issues(content)
+            return content
             
         except Exception as e:
             if self.debug:
                 print(f"\nError generating usage guide: {str(e)}")
             return "### Usage\n\nUsage instructions could not be generated."
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_contributing_guide(self, file_manifest: Dict[str, Any]) -> str:
         """
         Generate contributing guide based on project structure.
@@ -677,32 +675,19 @@ class OllamaClient(BaseLLMClient):
             str: Generated contributing guide in markdown format
         """
         try:
-            response = await self.client.chat(
-                model=self.selected_model,
-                messages=MessageManager.get_contributing_guide_messages(
+            content = await self._chat(
+                MessageManager.get_contributing_guide_messages(
                     self.project_structure
-                ),
-                options={"temperature": self.temperature}
+                )
             )
             
-            content = response['message']['content']
-            
-            # Fix any markdown issues
-            return self._fix_markdown_issues(content)
+            return content
             
         except Exception as e:
             if self.debug:
                 print(f"\nError generating contributing guide: {str(e)}")
             return "### Contributing\n\nContribution guidelines could not be generated."
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def generate_license_info(self, file_manifest: Dict[str, Any]) -> str:
         """
         Generate license information based on project structure.
@@ -717,32 +702,19 @@ class OllamaClient(BaseLLMClient):
             str: Generated license information in markdown format
         """
         try:
-            response = await self.client.chat(
-                model=self.selected_model,
-                messages=MessageManager.get_license_info_messages(
+            content = await self._chat(
+                MessageManager.get_license_info_messages(
                     self.project_structure
-                ),
-                options={"temperature": self.temperature}
+                )
             )
             
-            content = response['message']['content']
-            
-            # Fix any markdown issues
-            return self._fix_markdown_issues(content)
+            return content
             
         except Exception as e:
             if self.debug:
                 print(f"\nError generating license info: {str(e)}")
             return "This project's license information could not be determined."
 
-    @async_retry(
-        retries=DEFAULT_RETRIES,
-        delay=DEFAULT_RETRY_DELAY,
-        backoff=2.0,
-        max_delay=30.0,
-        jitter=True,
-        exceptions=(httpx.HTTPError, ConnectionError, TimeoutError),
-    )
     async def enhance_documentation(self, existing_content: str, file_manifest: Dict[str, Any], doc_type: str) -> str:
         """
         Enhance existing documentation with new insights.
@@ -765,22 +737,17 @@ class OllamaClient(BaseLLMClient):
             # Get key components
             key_components = self._identify_key_components(file_manifest)
             
-            response = await self.client.chat(
-                model=self.selected_model,
-                messages=MessageManager.get_enhance_documentation_messages(
+            content = await self._chat(
+                MessageManager.get_enhance_documentation_messages(
                     existing_content,
                     self.project_structure,
                     key_components,
                     tech_report,
                     doc_type
-                ),
-                options={"temperature": self.temperature}
+                )
             )
             
-            content = response['message']['content']
-            
-            # Fix any markdown issues
-            return self._fix_markdown_issues(content)
+            return content
             
         except Exception as e:
             if self.debug:
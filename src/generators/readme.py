@@ -1,4 +1,5 @@
 # Standard library imports
+import asyncio
 import logging
 import re
 import traceback
@@ -228,26 +229,26 @@ async def generate_new_readme(
     Returns:
         str: Generated README content
     """
-    # Generate all the sections
-    overview = await generate_overview_with_fallbacks(
-        repo_path, llm_client, file_manifest, project_name, architecture_file_exists
-    )
-    
-    usage = await generate_section(
-        llm_client, file_manifest, 'usage_guide', 
-        CONTENT_THRESHOLDS['usage_guide_length'],
-        "Please refer to project documentation for usage instructions."
+    # Generate the independent sections concurrently; each one handles its own errors
+    overview, usage, license_info = await asyncio.gather(
+        generate_overview_with_fallbacks(
+            repo_path, llm_client, file_manifest, project_name, architecture_file_exists
+        ),
+        generate_section(
+            llm_client, file_manifest, 'usage_guide', 
+            CONTENT_THRESHOLDS['usage_guide_length'],
+            "Please refer to project documentation for usage instructions."
+        ),
+        generate_section(
+            llm_client, file_manifest, 'license_info',
+            CONTENT_THRESHOLDS['license_info_length'],
+            "Please refer to the LICENSE file for license information."
+        ),
     )
     
     # Contributing section is now in a separate file
     contributing = "For contribution guidelines, see [CONTRIBUTING.md](CONTRIBUTING.md)."
     
-    license_info = await generate_section(
-        llm_client, file_manifest, 'license_info',
-        CONTENT_THRESHOLDS['license_info_length'],
-        "Please refer to the LICENSE file for license information."
-    )
-    
     # Add architecture link if ARCHITECTURE.md exists
     architecture_section = ""
     if architecture_file_exists:
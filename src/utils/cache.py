@@ -8,6 +8,7 @@ import sqlite3
 import time
 import hashlib
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -37,6 +38,11 @@ class CacheBackend(ABC):
         """Store a value in cache."""
         pass
     
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a value from cache."""
+        pass
+    
     @abstractmethod
     def clear(self) -> None:
         """Clear all cached values."""
@@ -92,6 +98,10 @@ class SQLiteCache(CacheBackend):
                 )
             )
 
+    def delete(self, key: str) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
     def clear(self) -> None:
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("DELETE FROM cache")
@@ -99,18 +109,82 @@ class SQLiteCache(CacheBackend):
 class MemoryCache(CacheBackend):
     """In-memory cache backend for fast access."""
     
-    def __init__(self):
-        self.cache: Dict[str, CacheEntry] = {}
+    def __init__(self, max_entries: Optional[int] = None):
+        """Initialize the memory cache.
+        
+        Args:
+            max_entries: Maximum number of entries to keep, evicting the least
+                recently used one beyond that, or None for no limit
+        """
+        self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.max_entries = max_entries
     
     def get(self, key: str) -> Optional[CacheEntry]:
-        return self.cache.get(key)
+        entry = self.cache.get(key)
+        if entry is not None:
+            self.cache.move_to_end(key)
+        return entry
     
     def set(self, key: str, entry: CacheEntry) -> None:
         self.cache[key] = entry
+        self.cache.move_to_end(key)
+        if self.max_entries is not None and len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        self.cache.pop(key, None)
     
     def clear(self) -> None:
         self.cache.clear()
 
+class ResponseCache:
+    """Content-addressed cache of LLM responses.
+    
+    Responses are keyed by a hash of the model, generation settings and request
+    content, so an identical request is answered from the cache instead of the model.
+    Callers should only cache deterministic requests (temperature 0).
+    """
+    
+    # Number of responses kept by the default in-memory backend
+    DEFAULT_MAX_ENTRIES = 256
+    
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        """Initialize the response cache.
+        
+        Args:
+            backend: Storage backend for the responses (defaults to an in-memory
+                LRU cache of DEFAULT_MAX_ENTRIES responses)
+            ttl: Time to live in seconds, or None to keep responses indefinitely
+        """
+        self.backend = backend if backend is not None else MemoryCache(max_entries=self.DEFAULT_MAX_ENTRIES)
+        self.ttl = ttl
+    
+    @staticmethod
+    def make_key(model: str, temperature: float, *parts: Any) -> str:
+        """Create a cache key from the model, temperature and request content."""
+        payload = json.dumps([model, temperature, *parts], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if missing or expired."""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        if self.ttl and time.time() - entry.timestamp > self.ttl:
+            self.backend.delete(key)
+            return None
+        return entry.value
+    
+    def set(self, key: str, response: str) -> None:
+        """Store a response under a key."""
+        self.backend.set(key, CacheEntry(
+            key=key,
+            value=response,
+            hash=key,
+            timestamp=time.time(),
+            metadata={}
+        ))
+
 def hash_path(path: Path) -> str:
     """Generate a stable hash for a file path."""
     return str(abs(hash(str(path.absolute()))) % 10000)
@@ -15,6 +15,7 @@ Configuration Schema:
         - timeout: Request timeout in seconds
         - concurrency: Number of concurrent requests
         - temperature: Temperature for generation (0.0 = deterministic)
+        - keep_alive: How long the server keeps the model loaded (optional)
     - bedrock: AWS Bedrock-specific configuration
         - region: AWS region
         - model_id: Bedrock model ID
@@ -6,7 +6,7 @@ Configuration class for codebase-scribe.
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 
 @dataclass
 class PromptTemplatesConfig:
@@ -106,6 +106,7 @@ class OllamaConfig(LLMProviderConfig):
     retries: int = 5
     retry_delay: float = 2.0
     temperature: float = 0.5
+    keep_alive: Optional[Union[str, int]] = None  # How long the server keeps the model loaded (None = server default)
 
 
 @dataclass
@@ -214,7 +215,8 @@ class ScribeConfig:
                 concurrency=ollama_dict.get('concurrency', 1),
                 model=ollama_dict.get('model', 'llama2'),
                 base_url=ollama_dict.get('base_url', 'http://localhost:11434'),
-                timeout=ollama_dict.get('timeout', 60)
+                timeout=ollama_dict.get('timeout', 60),
+                keep_alive=ollama_dict.get('keep_alive')
             )
         
         # Set Bedrock settings
@@ -291,7 +293,8 @@ class ScribeConfig:
                 'concurrency': self.ollama.concurrency,
                 'model': self.ollama.model,
                 'base_url': self.ollama.base_url,
-                'timeout': self.ollama.timeout
+                'timeout': self.ollama.timeout,
+                'keep_alive': self.ollama.keep_alive
             },
             'bedrock': {
                 'concurrency': self.bedrock.concurrency,
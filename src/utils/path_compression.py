@@ -109,9 +109,8 @@ def get_compression_explanation(decompression_map: Dict[str, str]) -> str:
     Returns:
         String explaining the compression scheme
     """
-    explanation = "Note: To save tokens, file paths have been compressed using the following scheme:\n\n"
-    for key, value in decompression_map.items():
-        explanation += f"- {key} = {value}\n"
-    explanation += "\nFor example, @1/Controller.java represents src/main/java/com/example/project/Controller.java\n"
+    lines = ["Note: To save tokens, file paths have been compressed using the following scheme:\n"]
+    lines.extend(f"- {key} = {value}" for key, value in decompression_map.items())
+    lines.append("\nFor example, @1/Controller.java represents src/main/java/com/example/project/Controller.java\n")
     
-    return explanation
\ No newline at end of file
+    return '\n'.join(lines)
\ No newline at end of file
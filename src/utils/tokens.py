@@ -6,6 +6,7 @@ import ssl
 import requests
 from urllib3.exceptions import SSLError
 import json
+from collections import OrderedDict
 from pathlib import Path
 
 class TokenCounter:
@@ -17,6 +18,9 @@ class TokenCounter:
     DEFAULT_CHUNK_BUFFER = 0.8       # Default 80% of limit for chunk_text
     DEFAULT_OVERSIZED_TARGET = 0.8   # Default 80% target for handle_oversized_input
     
+    # Number of distinct texts whose token counts are remembered by count_tokens
+    TOKEN_COUNT_CACHE_SIZE = 256
+    
     # Default token limits for different models
     MODEL_LIMITS = {
         # Anthropic models
@@ -81,6 +85,9 @@ class TokenCounter:
         self.chunk_buffer = chunk_buffer if chunk_buffer is not None else self.DEFAULT_CHUNK_BUFFER
         self.oversized_target = oversized_target if oversized_target is not None else self.DEFAULT_OVERSIZED_TARGET
         
+        # Recently counted texts, so repeated system prompts and re-checks skip the tokenizer
+        self._token_count_cache: "OrderedDict[str, int]" = OrderedDict()
+        
         # Load model limits from config file if provided
         if config_path:
             self._load_model_limits_from_config(config_path)
@@ -197,8 +204,17 @@ class TokenCounter:
         if not text:
             return 0
         
-        tokens = self.encoding.encode(text)
-        return len(tokens)
+        cache = self._token_count_cache
+        count = cache.get(text)
+        if count is not None:
+            cache.move_to_end(text)
+            return count
+        
+        count = len(self.encoding.encode(text))
+        cache[text] = count
+        if len(cache) > self.TOKEN_COUNT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return count
     
     def count_message_tokens(self, messages: List[Dict[str, str]]) -> int:
         """Count tokens in a list of chat messages."""
@@ -223,6 +239,30 @@ class TokenCounter:
         
         return total_tokens
     
+    def may_exceed_limit(self, text: str, model_name: Optional[str] = None,
+                         buffer_percentage: Optional[float] = None) -> bool:
+        """Cheaply check whether text could exceed the token limit, without tokenizing it.
+        
+        Every token covers at least one UTF-8 byte, so text with no more bytes than
+        the effective limit cannot exceed it. A True result only means that
+        will_exceed_limit has to be called to find out.
+        
+        Args:
+            text: Text to check
+            model_name: Optional model name to check against (defaults to instance model)
+            buffer_percentage: Percentage buffer to leave (defaults to self.buffer_percentage)
+            
+        Returns:
+            False if the text is guaranteed to fit, True otherwise
+        """
+        buffer = buffer_percentage if buffer_percentage is not None else self.buffer_percentage
+        effective_limit = int(self.get_token_limit(model_name) * (1 - buffer))
+        
+        # A character is at most 4 bytes, so short text needs no encoding at all
+        if len(text) * 4 <= effective_limit:
+            return False
+        return len(text.encode('utf-8')) > effective_limit
+    
     def will_exceed_limit(self, text_or_messages: Union[str, List[Dict[str, str]]],
                            model_name: Optional[str] = None,
                            buffer_percentage: Optional[float] = None) -> Tuple[bool, int]:
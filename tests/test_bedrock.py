@@ -163,6 +163,23 @@ async def test_create_and_invoke_bedrock_request(bedrock_config):
         # We can't easily verify the exact request body in this test
         # because asyncio.to_thread is mocked and doesn't preserve the arguments
         # in the same way as a regular function call
+        
+        # The system prompt is sent in the Anthropic system field, not merged into the user message
+        body = json.loads(mock_to_thread.call_args.kwargs["body"])
+        assert body["system"] == "System content"
+        assert body["messages"] == [
+            {"role": "user", "content": [{"type": "text", "text": "User content"}]}
+        ]
+        
+        # An identical request is answered from the response cache
+        mock_to_thread.reset_mock()
+        cached = await client._create_and_invoke_bedrock_request("System content", "User content")
+        assert cached == "Fixed test response"
+        assert not mock_to_thread.called
+        
+        # A different request still goes to the model
+        await client._create_and_invoke_bedrock_request("System content", "Other content")
+        assert mock_to_thread.called
 
 
 @pytest.mark.asyncio
@@ -5,7 +5,7 @@ import sqlite3
 import pickle
 import hashlib
 from pathlib import Path
-from src.utils.cache import CacheManager, CacheEntry, SQLiteCache, MemoryCache
+from src.utils.cache import CacheManager, CacheEntry, SQLiteCache, MemoryCache, ResponseCache
 
 @pytest.fixture
 def test_file(tmp_path):
@@ -130,6 +130,40 @@ def test_memory_cache_operations():
     # Clear the cache
     memory_cache.clear()
     assert memory_cache.get("test_key") is None
+
+def test_response_cache_operations(tmp_path):
+    """Test response cache keys, lookups and expiry"""
+    key = ResponseCache.make_key("model", 0, "system", "user")
+    assert key == ResponseCache.make_key("model", 0, "system", "user")
+    assert key != ResponseCache.make_key("model", 0, "system", "other user")
+    assert key != ResponseCache.make_key("other-model", 0, "system", "user")
+    
+    # Works with any backend, including persistent ones
+    response_cache = ResponseCache(SQLiteCache(tmp_path / "responses.db"), ttl=60)
+    assert response_cache.get(key) is None
+    response_cache.set(key, "cached response")
+    assert response_cache.get(key) == "cached response"
+    
+    # Expired responses are ignored and evicted
+    response_cache.ttl = 0.001
+    time.sleep(0.01)
+    assert response_cache.get(key) is None
+    assert response_cache.backend.get(key) is None
+
+def test_response_cache_default_backend_is_bounded():
+    """Test that the default response cache evicts the least recently used response"""
+    assert ResponseCache().backend.max_entries == ResponseCache.DEFAULT_MAX_ENTRIES
+    
+    response_cache = ResponseCache(MemoryCache(max_entries=2))
+    response_cache.set("a", "response a")
+    response_cache.set("b", "response b")
+    assert response_cache.get("a") == "response a"
+    response_cache.set("c", "response c")
+    
+    assert response_cache.get("b") is None
+    assert response_cache.get("a") == "response a"
+    assert response_cache.get("c") == "response c"
+
 def test_calculate_file_hash(cache_manager, test_file):
     """Test file hash calculation with different algorithms"""
     # Set the hash algorithm to md5 explicitly
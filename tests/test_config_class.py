@@ -47,7 +47,8 @@ def sample_config_dict():
             'retry_delay': 1.0,
             'timeout': 30,
             'concurrency': 2,
-            'temperature': 0.1
+            'temperature': 0.1,
+            'keep_alive': '5m'
         },
         'bedrock': {
             'region': 'us-east-1',
@@ -105,6 +106,7 @@ class TestScribeConfig:
         assert isinstance(config.ollama, OllamaConfig)
         assert config.ollama.base_url == 'http://localhost:11434'
         assert config.ollama.concurrency == 2
+        assert config.ollama.keep_alive == '5m'
         
         assert isinstance(config.bedrock, BedrockConfig)
         assert config.bedrock.region == 'us-east-1'
@@ -1,14 +1,17 @@
 import json
 import pytest
 from pathlib import Path
+from src.clients import llm_utils
 from src.clients.llm_utils import (
     format_project_structure,
     find_common_dependencies,
     identify_key_components,
+    format_component_summaries,
     get_default_order,
     fix_markdown_issues,
     prepare_file_order_data,
     process_file_order_response,
+    invalidate_manifest_cache,
     DEFAULT_MAX_COMPONENTS,
     DEFAULT_VENDOR_PATTERNS
 )
@@ -38,6 +41,41 @@ def test_format_project_structure(sample_file_manifest):
     assert "dist/" in result
     assert "images/" in result
 
+def test_format_project_structure_layout():
+    """Test that files are listed before sorted subdirectories at each level."""
+    manifest = {
+        "setup.py": {},
+        "src/b.py": {},
+        "src/a.py": {},
+        "src/_files/data.txt": {},
+        "docs/index.md": {},
+    }
+    result = format_project_structure(manifest, force_compression=False)
+    assert result.split('\n') == [
+        "- setup.py",
+        "+ docs/",
+        "  - index.md",
+        "+ src/",
+        "  - a.py",
+        "  - b.py",
+        "  + _files/",
+        "    - data.txt",
+    ]
+
+def test_format_project_structure_normalizes_paths():
+    """Test that Windows separators and Path keys produce the same tree."""
+    manifest = {"src\\app\\main.py": {}, Path("src/app/util.py"): {}}
+    result = format_project_structure(manifest, force_compression=False)
+    assert result.split('\n') == ["+ src/", "  + app/", "    - main.py", "    - util.py"]
+
+def test_format_project_structure_deep_tree():
+    """Test indentation for trees deeper than the precomputed indent table."""
+    depth = 80
+    manifest = {"/".join(f"d{i}" for i in range(depth)) + "/leaf.py": {}}
+    lines = format_project_structure(manifest, force_compression=False).split('\n')
+    assert lines[0] == "+ d0/"
+    assert lines[-1] == " " * (2 * depth) + "- leaf.py"
+
 def test_find_common_dependencies(sample_file_manifest):
     """Test the find_common_dependencies function."""
     result = find_common_dependencies(sample_file_manifest)
@@ -47,6 +85,44 @@ def test_find_common_dependencies(sample_file_manifest):
     assert "react@^17.0.2" in result
     assert "lodash@^4.17.21" in result
 
+def test_find_common_dependencies_all_formats():
+    """Test dependency extraction for each supported dependency file format."""
+    manifest = {
+        "web/package.json": {"content": '{"dependencies": {"react": "18.2.0"}, "devDependencies": {"jest": "29.0.0"}}'},
+        "api/requirements.txt": {"content": "# comment\nflask==2.0.0\n\n"},
+        "App/App.csproj": {"content": '<PackageReference Include="Newtonsoft.Json" Version="13.0.1" />'},
+        "Legacy/packages.config": {"content": '<package id="NUnit" version="3.13.2" />'},
+        "java/pom.xml": {"content": "<dependency><groupId>org.junit</groupId><artifactId>junit</artifactId><version>4.13</version></dependency>"},
+        "java/build.gradle": {"content": "implementation 'com.google.guava:guava:31.0'"},
+        "kt/build.gradle.kts": {"content": 'implementation("io.ktor:ktor-server:2.0.0")'},
+        "bin/requirements.txt": {"content": "ignored==1.0", "is_binary": True},
+        "src/main.py": {"content": "import flask"},
+    }
+    result = find_common_dependencies(manifest)
+    for expected in (
+        "- npm:react@18.2.0",
+        "- npm-dev:jest@29.0.0",
+        "- python:flask==2.0.0",
+        "- nuget:Newtonsoft.Json@13.0.1",
+        "- nuget:NUnit@3.13.2",
+        "- maven:org.junit:junit@4.13",
+        "- gradle:com.google.guava:guava@31.0",
+        "- gradle-kts:io.ktor:ktor-server:2.0.0",
+    ):
+        assert expected in result
+    assert "ignored" not in result
+    assert "comment" not in result
+
+def test_find_common_dependencies_package_json_edge_cases():
+    """Test package.json parsing for malformed and dependency-free files."""
+    manifest = {
+        "a/package.json": {"content": '{"name": "app", "version": "1.0.0"}'},
+        "b/package.json": {"content": '{"dependencies": {"express": "4.18.0",}, '},
+        "c/package.json": {"content": '["not", "an", "object"]'},
+    }
+    result = find_common_dependencies(manifest)
+    assert result == "Detected dependencies:\n- npm:express@4.18.0\n"
+
 def test_identify_key_components(sample_file_manifest):
     """Test the identify_key_components function."""
     result = identify_key_components(sample_file_manifest)
@@ -64,6 +140,93 @@ def test_identify_key_components_with_custom_max(sample_file_manifest):
     component_count = len([line for line in result.split('\n') if line.startswith('- ')])
     assert component_count == 2
 
+def test_identify_key_components_counts_and_order():
+    """Test that key components are ordered by file count with their counts shown."""
+    manifest = {
+        "README.md": {},
+        "src/a.py": {}, "src/b.py": {}, "src/c.py": {},
+        "src/utils/d.py": {}, "src/utils/e.py": {},
+    }
+    result = identify_key_components(manifest)
+    assert result == (
+        "Key components:\n"
+        "- src (3 files)\n"
+        "- src/utils (2 files)\n"
+        "- root (1 files)\n"
+    )
+
+def test_format_component_summaries():
+    """Test that component summaries keep the longest summaries of each directory."""
+    from src.models.file_info import FileInfo
+    manifest = {
+        "src/a.py": {"summary": "a"},
+        "src/b.py": {"summary": "bbbb"},
+        "src/c.py": FileInfo(path="src/c.py", summary="ccc"),
+        "src/d.py": {"summary": "dd"},
+        "src/f.py": {"summary": "ff"},
+        "src/e.bin": {"summary": "binary file summary", "is_binary": True},
+        "main.py": FileInfo(path="main.py", summary="entry point"),
+        "empty.py": {"summary": ""},
+    }
+    result = format_component_summaries(manifest)
+    assert result == (
+        "## Component: src\n\n"
+        "File: src/b.py\nSummary: bbbb\n\n"
+        "File: src/c.py\nSummary: ccc\n\n"
+        "File: src/d.py\nSummary: dd\n\n"
+        "## Component: .\n\n"
+        "File: main.py\nSummary: entry point"
+    )
+
+def test_format_component_summaries_windows_paths():
+    """Test that component summaries group backslash-separated paths by directory."""
+    manifest = {
+        "src\\a.py": {"summary": "first"},
+        "src\\b.py": {"summary": "second"},
+    }
+    result = format_component_summaries(manifest)
+    assert result.startswith("## Component: src\n\n")
+    assert result.count("## Component:") == 1
+
+def test_manifest_helpers_are_memoized(sample_file_manifest, monkeypatch):
+    """Test that repeated calls with an unchanged manifest reuse the memoized result."""
+    invalidate_manifest_cache()
+    first = find_common_dependencies(sample_file_manifest)
+    
+    # A second call is answered from the cache without parsing dependency files
+    def fail(*args, **kwargs):
+        raise AssertionError("dependency file parsed again")
+    monkeypatch.setattr('src.clients.llm_utils._DEPENDENCY_HANDLERS',
+                        tuple((name, fail) for name, _ in llm_utils._DEPENDENCY_HANDLERS))
+    assert find_common_dependencies(sample_file_manifest) == first
+
+def test_manifest_cache_sees_in_place_edits(sample_file_manifest):
+    """Test that editing a manifest in place invalidates its memoized results."""
+    invalidate_manifest_cache()
+    assert "flask" not in find_common_dependencies(sample_file_manifest)
+    
+    # Mutate content in place without changing the manifest size
+    sample_file_manifest["requirements.txt"]["content"] = "flask==2.0.0"
+    assert "flask==2.0.0" in find_common_dependencies(sample_file_manifest)
+    
+    sample_file_manifest["src/main.py"]["summary"] = "Entry point"
+    assert "Entry point" in format_component_summaries(sample_file_manifest)
+
+def test_manifest_cache_stores_only_results(sample_file_manifest):
+    """Test that memoized entries do not keep manifests alive."""
+    invalidate_manifest_cache()
+    identify_key_components(sample_file_manifest)
+    assert all(isinstance(result, str) for result in llm_utils._manifest_cache.values())
+
+def test_manifest_cache_distinguishes_manifests_and_options(sample_file_manifest):
+    """Test that memoized results are not shared between manifests or options."""
+    invalidate_manifest_cache()
+    assert "src" in identify_key_components(sample_file_manifest)
+    assert "lib" in identify_key_components({"lib/a.py": {}, "lib/b.py": {}})
+    
+    limited = identify_key_components(sample_file_manifest, max_components=1)
+    assert len([line for line in limited.split('\n') if line.startswith('- ')]) == 1
+
 def test_get_default_order():
     """Test the get_default_order function."""
     core_files = {
@@ -114,6 +277,11 @@ def test_fix_markdown_issues():
     assert "  - Subitem with wrong indentation" in fixed
     assert "  - Another subitem with wrong indentation" in fixed  # Should be adjusted to 2 spaces
 
+def test_fix_markdown_issues_plain_text_unchanged():
+    """Test that content without headers or list items is returned as is."""
+    plain = "Just a paragraph.\n\nAnother paragraph with a-hyphen and 3 * 4 math."
+    assert fix_markdown_issues(plain) is plain
+
 def test_prepare_file_order_data(sample_file_manifest):
     """Test the prepare_file_order_data function."""
     core_files, resource_files, files_info = prepare_file_order_data(sample_file_manifest)
@@ -130,9 +298,38 @@ def test_prepare_file_order_data(sample_file_manifest):
     assert "images/logo.png" in resource_files
     
     # Check files_info
-    assert files_info["src/main.py"]["type"] == "python"
-    assert files_info["src/utils.py"]["size"] == 18
-    assert not files_info["src/config.json"]["is_binary"]
+    assert files_info["src/main.py"].type == "python"
+    assert files_info["src/utils.py"].size == 18
+    assert not files_info["src/config.json"].is_binary
+
+def test_prepare_file_order_data_custom_vendor_patterns(sample_file_manifest):
+    """Test prepare_file_order_data with custom and empty vendor patterns."""
+    core_files, resource_files, _ = prepare_file_order_data(
+        sample_file_manifest, vendor_patterns=[r'^SRC/', r'\.txt$']
+    )
+    assert set(resource_files) == {"src/main.py", "src/utils.py", "src/config.json", "requirements.txt"}
+    assert "dist/bundle.min.js" in core_files
+    
+    core_files, resource_files, _ = prepare_file_order_data(sample_file_manifest, vendor_patterns=[])
+    assert not resource_files
+    assert len(core_files) == len(sample_file_manifest)
+
+def test_prepare_file_order_data_with_objects():
+    """Test prepare_file_order_data with object-style file information."""
+    from src.models.file_info import FileInfo
+    project_files = {
+        "src/app.py": FileInfo(path="src/app.py", file_type="python", size=42, exports={"main"}),
+        "src/notes.txt": {"size": 5},
+    }
+    
+    _, _, files_info = prepare_file_order_data(project_files)
+    
+    assert files_info["src/app.py"].type == "python"
+    assert files_info["src/app.py"].size == 42
+    assert files_info["src/app.py"].exports == ["main"]
+    # Falls back to the file extension when no type is known
+    assert files_info["src/notes.txt"].type == ".txt"
+    assert files_info["src/notes.txt"].dependencies == []
 
 def test_process_file_order_response_json():
     """Test the process_file_order_response function with JSON response."""
@@ -147,6 +344,31 @@ def test_process_file_order_response_json():
     
     assert result == ["file1.py", "file2.py", "file3.py", "vendor.js"]
 
+def test_process_file_order_response_json_with_whitespace_and_bad_structure():
+    """Test JSON detection with leading whitespace and malformed file_order values."""
+    core_files = {"file1.py": {}, "file2.py": {}}
+    resource_files = {"vendor.js": {}}
+    
+    content = "\n  " + json.dumps({"file_order": ["file2.py", "file1.py"]})
+    assert process_file_order_response(content, core_files, resource_files) == ["file2.py", "file1.py", "vendor.js"]
+    
+    # A non-list file_order falls back to the default order
+    content = json.dumps({"file_order": 5})
+    assert set(process_file_order_response(content, core_files, resource_files)) == {"file1.py", "file2.py", "vendor.js"}
+
+@pytest.mark.parametrize("error", [RecursionError("maximum recursion depth exceeded"), ValueError("bad input")])
+def test_process_file_order_response_json_errors_fall_back_to_text(monkeypatch, error):
+    """Test that errors raised while parsing a JSON-looking response fall back to text extraction."""
+    def failing_loads(content):
+        raise error
+    monkeypatch.setattr(llm_utils, "_json_loads", failing_loads)
+    content = '{"file_order": ["file2.py", "file1.py"]'
+    core_files = {"file1.py": {}, "file2.py": {}}
+    
+    result = process_file_order_response(content, core_files, {"vendor.js": {}})
+    
+    assert result == ["file2.py", "file1.py", "vendor.js"]
+
 def test_process_file_order_response_text():
     """Test the process_file_order_response function with text response."""
     content = """
@@ -166,6 +388,15 @@ def test_process_file_order_response_text():
     assert "file3.py" in result
     assert "vendor.js" in result
 
+def test_process_file_order_response_text_order_and_duplicates():
+    """Test that text extraction keeps first-mention order and prefers longer paths."""
+    content = "Start with src/main.py, then main.py, then src/main.py again and lib.py."
+    core_files = {"main.py": {}, "src/main.py": {}, "lib.py": {}}
+    
+    result = process_file_order_response(content, core_files, {})
+    
+    assert result == ["src/main.py", "main.py", "lib.py"]
+
 def test_process_file_order_response_invalid():
     """Test the process_file_order_response function with invalid response."""
     content = "This response doesn't contain any file paths or valid JSON."
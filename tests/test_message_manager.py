@@ -62,10 +62,11 @@ class TestMessageManager(unittest.TestCase):
         
         self.assertEqual(len(messages), 2)
         self.assertEqual(messages[0]["role"], "system")
-        self.assertIn(project_structure, messages[0]["content"])
-        self.assertIn(tech_report, messages[0]["content"])
+        self.assertNotIn(project_structure, messages[0]["content"])
         self.assertEqual(messages[1]["role"], "user")
-        self.assertEqual(messages[1]["content"], template_content)
+        self.assertIn(project_structure, messages[1]["content"])
+        self.assertIn(tech_report, messages[1]["content"])
+        self.assertTrue(messages[1]["content"].endswith(template_content))
         
         # Test with invalid inputs
         with self.assertRaises(ValueError):
@@ -77,6 +78,48 @@ class TestMessageManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             MessageManager.get_project_overview_messages(project_structure, tech_report, "")
     
+    def test_system_prompts_are_independent_of_project_data(self):
+        """Test that project context goes into the user message, leaving a stable system prefix."""
+        first = MessageManager.get_component_relationship_messages("src/\n  a.py", "Python")
+        second = MessageManager.get_component_relationship_messages("lib/\n  b.js", "Node.js")
+        self.assertEqual(first[0]["content"], second[0]["content"])
+        self.assertIn("lib/\n  b.js", second[1]["content"])
+        self.assertIn("Node.js", second[1]["content"])
+        
+        first = MessageManager.get_enhance_documentation_messages(
+            "# Old", "src/\n  a.py", "Core", "Python", "README"
+        )
+        second = MessageManager.get_enhance_documentation_messages(
+            "# Older", "lib/\n  b.js", "Api", "Node.js", "README"
+        )
+        self.assertEqual(first[0]["content"], second[0]["content"])
+        self.assertIn("README", first[0]["content"])
+        
+        # Whitespace-only input is rejected with the field's name
+        with self.assertRaisesRegex(ValueError, "Doc type must be a non-empty string"):
+            MessageManager.get_enhance_documentation_messages(
+                "# Old", "src/\n  a.py", "Core", "Python", " \n"
+            )
+        
+        # Known and unknown doc types render the same way
+        for doc_type in ("README.md", "CHANGELOG.md"):
+            messages = MessageManager.get_enhance_documentation_messages(
+                "# Old", "src/\n  a.py", "Core", "Python", doc_type
+            )
+            self.assertIn(f"specializing in {doc_type} files", messages[0]["content"])
+            self.assertIn(f"existing {doc_type} file by", messages[0]["content"])
+        for value in ("# Older", "lib/\n  b.js", "Api", "Node.js"):
+            self.assertIn(value, second[1]["content"])
+    
+    def test_user_messages_are_memoized(self):
+        """Test that identical inputs reuse the rendered user message."""
+        first = MessageManager.get_usage_guide_messages("src/\n  a.py", "Python")
+        second = MessageManager.get_usage_guide_messages("src/\n  a.py", "Python")
+        self.assertIs(first[1]["content"], second[1]["content"])
+        
+        other = MessageManager.get_usage_guide_messages("src/\n  a.py", "Node.js")
+        self.assertIn("Node.js", other[1]["content"])
+    
     def test_get_file_summary_messages(self):
         """Test the get_file_summary_messages method."""
         # Test with valid input
@@ -94,6 +137,41 @@ class TestMessageManager(unittest.TestCase):
         with self.assertRaises(ValueError):
             MessageManager.get_file_summary_messages("")
     
+    def test_get_file_order_messages(self):
+        """Test the get_file_order_messages method with dict and record file info."""
+        from src.clients.llm_utils import FileOrderInfo
+        files_info = {
+            "main.py": FileOrderInfo("python", 10, False, ["utils.py"], []),
+            "utils.py": {"type": "python", "size": 5},
+        }
+        
+        messages = MessageManager.get_file_order_messages(files_info)
+        
+        self.assertEqual(len(messages), 2)
+        self.assertIn("file_order", messages[0]["content"])
+        payload = json.loads(messages[1]["content"])
+        self.assertEqual(payload["files"]["main.py"]["type"], "python")
+        self.assertEqual(payload["files"]["main.py"]["dependencies"], ["utils.py"])
+        self.assertEqual(payload["files"]["utils.py"], {"type": "python", "size": 5})
+        
+        # The payload is compact JSON, since only the model reads it
+        self.assertNotIn("\n", messages[1]["content"])
+        
+        # The payload does not depend on the order the files were listed in
+        reordered = dict(reversed(list(files_info.items())))
+        self.assertEqual(
+            MessageManager.get_file_order_messages(reordered)[1]["content"],
+            messages[1]["content"]
+        )
+        
+        # Non-string keys are still serialized the way json.dumps does
+        payload = json.loads(MessageManager.get_file_order_messages({1: {"size": 5}})[1]["content"])
+        self.assertEqual(payload["files"], {"1": {"size": 5}})
+        
+        # Test with invalid input
+        with self.assertRaises(ValueError):
+            MessageManager.get_file_order_messages(["main.py"])
+    
     def test_check_and_truncate_messages_under_limit(self):
         """Test check_and_truncate_messages when messages are under the token limit."""
         # Create mock token counter
@@ -186,6 +264,82 @@ class TestMessageManager(unittest.TestCase):
             "Intelligently reduced but still too long", expected_effective_limit
         )
     
+    def test_check_and_truncate_messages_does_not_modify_input(self):
+        """Test that truncation leaves the caller's messages untouched."""
+        mock_token_counter = MagicMock()
+        mock_token_counter.will_exceed_limit.side_effect = [(True, 1000), (False, 800)]
+        mock_token_counter.handle_oversized_input.return_value = "Reduced content"
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Very long content that exceeds the token limit."}
+        ]
+        
+        result = MessageManager.check_and_truncate_messages(messages, mock_token_counter, "test-model")
+        
+        self.assertIsNot(result, messages)
+        self.assertIs(result[0], messages[0])
+        self.assertEqual(result[1]["content"], "Reduced content")
+        self.assertEqual(messages[1]["content"], "Very long content that exceeds the token limit.")
+    
+    def test_check_and_truncate_messages_skips_recheck_when_unchanged(self):
+        """Test that an unchanged intelligent reduction goes straight to hard truncation."""
+        mock_token_counter = MagicMock()
+        mock_token_counter.will_exceed_limit.return_value = (True, 1000)
+        mock_token_counter.handle_oversized_input.side_effect = lambda text, target_percentage: text
+        mock_token_counter.count_message_tokens.return_value = 50
+        mock_token_counter.get_token_limit.return_value = 500
+        mock_token_counter.truncate_text.return_value = "Hard truncated content"
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "Dense content."}
+        ]
+        
+        result = MessageManager.check_and_truncate_messages(messages, mock_token_counter, "test-model")
+        
+        self.assertEqual(result[1]["content"], "Hard truncated content")
+        self.assertEqual(messages[1]["content"], "Dense content.")
+        mock_token_counter.will_exceed_limit.assert_called_once()
+    
+    def test_check_and_truncate_messages_hard_truncation_counts_reduced_messages(self):
+        """Test that hard truncation budgets against the already reduced other messages."""
+        mock_token_counter = MagicMock()
+        mock_token_counter.will_exceed_limit.return_value = (True, 1000)
+        mock_token_counter.handle_oversized_input.side_effect = lambda text, target_percentage: text[:5]
+        mock_token_counter.count_message_tokens.return_value = 50
+        mock_token_counter.get_token_limit.return_value = 500
+        mock_token_counter.truncate_text.return_value = "Hard"
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "First long request."},
+            {"role": "user", "content": "Second long request."}
+        ]
+        
+        MessageManager.check_and_truncate_messages(messages, mock_token_counter, "test-model")
+        
+        other_messages = mock_token_counter.count_message_tokens.call_args.args[0]
+        self.assertEqual([m["content"] for m in other_messages], ["You are a helpful assistant.", "Secon"])
+    
+    def test_check_and_truncate_messages_stops_after_first_fit(self):
+        """Test that reduction stops at the first user message that brings the prompt under the limit."""
+        mock_token_counter = MagicMock()
+        mock_token_counter.will_exceed_limit.side_effect = [(True, 1000), (False, 800)]
+        mock_token_counter.handle_oversized_input.side_effect = lambda text, target_percentage: text[:5]
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "First long request."},
+            {"role": "user", "content": "Second long request."}
+        ]
+        
+        result = MessageManager.check_and_truncate_messages(messages, mock_token_counter, "test-model")
+        
+        self.assertEqual([m["content"] for m in result[1:]], ["First", "Second long request."])
+        mock_token_counter.handle_oversized_input.assert_called_once()
+        self.assertEqual(mock_token_counter.will_exceed_limit.call_count, 2)
+    
     def test_check_and_truncate_messages_invalid_inputs(self):
         """Test check_and_truncate_messages with invalid inputs."""
         mock_token_counter = MagicMock()
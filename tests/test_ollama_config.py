@@ -8,7 +8,7 @@ import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 from typing import Dict, Any
 
-from src.clients.ollama import OllamaClient
+from src.clients.ollama import DEFAULT_CONNECT_TIMEOUT, DEFAULT_POOL_LIMITS, DEFAULT_POOL_TIMEOUT, OllamaClient
 from src.utils.config_class import ScribeConfig
 
 
@@ -79,7 +79,14 @@ class TestOllamaClient:
     def test_client_initialization(self, mock_async_client, sample_config):
         """Test that the AsyncClient is initialized with the correct host."""
         OllamaClient(sample_config)
-        mock_async_client.assert_called_once_with(host='http://test-ollama:11434')
+        mock_async_client.assert_called_once()
+        assert mock_async_client.call_args.kwargs['host'] == 'http://test-ollama:11434'
+        assert mock_async_client.call_args.kwargs['limits'] is DEFAULT_POOL_LIMITS
+        timeout = mock_async_client.call_args.kwargs['timeout']
+        assert timeout.read is None
+        assert timeout.write is None
+        assert timeout.connect == DEFAULT_CONNECT_TIMEOUT
+        assert timeout.pool == DEFAULT_POOL_TIMEOUT
 
     @patch('src.clients.ollama.PromptTemplate')
     def test_prompt_template_initialization(self, mock_prompt_template, sample_config_dict):
@@ -0,0 +1,61 @@
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.utils.tokens import TokenCounter
+
+@pytest.fixture
+def token_counter():
+    """Fixture to provide a TokenCounter with a word-splitting encoding."""
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda text: text.split()
+    with patch('src.utils.tokens.tiktoken.get_encoding', return_value=encoding):
+        counter = TokenCounter(model_name="gpt-4")
+    return counter
+
+def test_count_tokens_caches_repeated_text(token_counter):
+    """Test that counting the same text twice only tokenizes it once."""
+    assert token_counter.count_tokens("one two three") == 3
+    assert token_counter.count_tokens("one two three") == 3
+    assert token_counter.encoding.encode.call_count == 1
+
+    assert token_counter.count_tokens("four five") == 2
+    assert token_counter.encoding.encode.call_count == 2
+    assert token_counter.count_tokens("") == 0
+
+def test_count_tokens_cache_is_bounded(token_counter):
+    """Test that the token count cache evicts the least recently used text."""
+    token_counter.TOKEN_COUNT_CACHE_SIZE = 2
+    token_counter.count_tokens("a")
+    token_counter.count_tokens("b")
+    token_counter.count_tokens("a")
+    token_counter.count_tokens("c")
+
+    assert list(token_counter._token_count_cache) == ["a", "c"]
+    token_counter.count_tokens("b")
+    assert token_counter.encoding.encode.call_count == 4
+
+def test_count_message_tokens_reuses_cached_counts(token_counter):
+    """Test that re-checking messages does not re-tokenize unchanged content."""
+    messages = [
+        {"role": "system", "content": "static system prompt"},
+        {"role": "user", "content": "user request"},
+    ]
+    first = token_counter.count_message_tokens(messages)
+    messages[1] = {"role": "user", "content": "shorter"}
+    second = token_counter.count_message_tokens(messages)
+
+    assert first == 3 + 2 + 2 * 4 + 3
+    assert second == 3 + 1 + 2 * 4 + 3
+    assert token_counter.encoding.encode.call_count == 3
+
+def test_may_exceed_limit_skips_tokenization(token_counter):
+    """Test that the cheap limit check never tokenizes and never misses an overflow."""
+    token_counter.buffer_percentage = 0
+    limit = token_counter.get_token_limit()
+    
+    assert token_counter.may_exceed_limit("short text") is False
+    assert token_counter.may_exceed_limit("a" * limit) is False
+    assert token_counter.may_exceed_limit("a" * (limit + 1)) is True
+    # Multi-byte characters can take more than one token each
+    assert token_counter.may_exceed_limit("\u00e9" * (limit // 2 + 1)) is True
+    token_counter.encoding.encode.assert_not_called()